@@ -0,0 +1,144 @@
+from collections import OrderedDict
+import sys
+
+
+class LRUCache:
+    '''A mapping of bounded size that evicts its least recently used
+    entries, for caching searched scores for the life of a long-running
+    strategy without running out of memory.
+
+    The size of an entry is estimated as the sizes of its key and value,
+    plus ENTRY_OVERHEAD for the bookkeeping around them.
+
+    max_entries: int    -- most entries kept, or None for no limit
+    max_bytes: int      -- most estimated bytes kept, or None for no limit
+    size: int           -- estimated bytes of the entries kept
+    hits: int           -- number of lookups that found their key
+    misses: int         -- number of lookups that did not
+    evictions: int      -- number of entries evicted to stay in bounds
+    ENTRY_OVERHEAD: int -- class constant, estimated bytes used per entry
+                           besides its key and value
+    '''
+    # assign class constants
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        '''(LRUCache, int, int) -> NoneType
+
+        Initialize an empty LRUCache holding at most max_entries entries,
+        of at most max_bytes estimated bytes in all.
+
+        >>> cache = LRUCache(max_bytes=1000)
+        >>> for i in range(100):
+        ...     cache[i] = float(i)
+        >>> cache.size <= 1000, 0 < len(cache) < 100
+        (True, True)
+        '''
+        self.max_entries, self.max_bytes = max_entries, max_bytes
+        self._entries = OrderedDict()
+        self.size = 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __len__(self):
+        '''(LRUCache) -> int
+
+        Return the number of entries kept.
+        '''
+        return len(self._entries)
+
+    def __contains__(self, key):
+        '''(LRUCache, object) -> bool
+
+        Return whether key has an entry, without counting a lookup.
+        '''
+        return key in self._entries
+
+    def get(self, key, default=None):
+        '''(LRUCache, object, object) -> object
+
+        Return the value for key, marking it as the most recently used, or
+        default if key has no entry.
+
+        >>> cache = LRUCache(max_entries=2)
+        >>> cache['a'] = 1.0
+        >>> cache.get('a'), cache.get('b')
+        (1.0, None)
+        >>> cache.hits, cache.misses
+        (1, 1)
+        '''
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+    def __getitem__(self, key):
+        '''(LRUCache, object) -> object
+
+        Return the value for key, marking it as the most recently used.
+        Raise KeyError if key has no entry.
+        '''
+        if key not in self._entries:
+            self.misses += 1
+            raise KeyError(key)
+        return self.get(key)
+
+    def __setitem__(self, key, value):
+        '''(LRUCache, object, object) -> NoneType
+
+        Set the value for key, marking it as the most recently used, and
+        evict the least recently used entries until the cache is back
+        within its bounds.
+
+        >>> cache = LRUCache(max_entries=2)
+        >>> cache['a'], cache['b'] = 1.0, 0.0
+        >>> cache.get('a')
+        1.0
+        >>> cache['c'] = -1.0
+        >>> 'a' in cache, 'b' in cache, 'c' in cache
+        (True, False, True)
+        >>> cache.evictions
+        1
+        '''
+        if key in self._entries:
+            self.size -= self._entry_size(key, self._entries[key])
+            self._entries.move_to_end(key)
+        self._entries[key] = value
+        self.size += self._entry_size(key, value)
+
+        while ((self.max_entries is not None and
+                len(self._entries) > self.max_entries) or
+               (self.max_bytes is not None and self.size > self.max_bytes and
+                len(self._entries) > 1)):
+            old_key, old_value = self._entries.popitem(last=False)
+            self.size -= self._entry_size(old_key, old_value)
+            self.evictions += 1
+
+    def _entry_size(self, key, value):
+        '''(LRUCache, object, object) -> int
+
+        Return the estimated bytes used by an entry for key and value.
+        '''
+        return (sys.getsizeof(key) + sys.getsizeof(value) +
+                LRUCache.ENTRY_OVERHEAD)
+
+    def flush(self):
+        '''(LRUCache) -> NoneType
+
+        Do nothing: an LRUCache has nowhere to write back to. Strategies
+        call flush at the end of each search, for caches that do.
+        '''
+
+    def clear(self):
+        '''(LRUCache) -> NoneType
+
+        Remove every entry, keeping the counters.
+        '''
+        self._entries.clear()
+        self.size = 0
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,90 @@
+def encode_varint(n):
+    '''(int) -> bytes
+
+    Return n as a varint: 7 bits per byte, least significant first, with
+    the top bit of each byte set while more bytes follow.
+
+    Assume: n >= 0
+
+    >>> encode_varint(5)
+    b'\\x05'
+    >>> encode_varint(300)
+    b'\\xac\\x02'
+    '''
+    data = bytearray()
+    while n >= 0x80:
+        data.append(n & 0x7f | 0x80)
+        n >>= 7
+    data.append(n)
+    return bytes(data)
+
+
+def decode_varint(data, pos=0):
+    '''(bytes, int) -> tuple of (int, int)
+
+    Return the varint starting at index pos of data, and the index just
+    past it.
+
+    >>> decode_varint(b'\\xac\\x02\\x05')
+    (300, 2)
+    >>> decode_varint(b'\\xac\\x02\\x05', 2)
+    (5, 3)
+    '''
+    n, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def encode_grid(grid, p):
+    '''(list, str) -> bytes
+
+    Return a square grid of 'x', 'o' and None, with next player p, as the
+    dimension in a varint, then the cells at 2 bits each (0 for None, 1
+    for 'x', 2 for 'o') in row-major order after 1 bit set iff p is 'p2',
+    least significant first.
+
+    >>> encode_grid([['x', None], [None, 'o']], 'p2')
+    b'\\x02\\x03\\x01'
+    '''
+    code, shift = p == 'p2', 1
+    for row in grid:
+        for c in row:
+            if c == 'x':
+                code |= 1 << shift
+            elif c == 'o':
+                code |= 2 << shift
+            shift += 2
+    return encode_varint(len(grid)) + code.to_bytes((shift + 7) // 8,
+                                                    'little')
+
+
+def decode_grid(data):
+    '''(bytes) -> tuple of (list, str)
+
+    Return the grid and next player encoded in data by encode_grid.
+
+    >>> decode_grid(b'\\x02\\x03\\x01')
+    ([['x', None], [None, 'o']], 'p2')
+    '''
+    dimension, pos = decode_varint(data)
+    code = int.from_bytes(data[pos:], 'little')
+    p = 'p2' if code & 1 else 'p1'
+    code >>= 1
+    grid = []
+    for row_num in range(dimension):
+        row = []
+        for column_num in range(dimension):
+            row.append((None, 'x', 'o')[code & 3])
+            code >>= 2
+        grid.append(row)
+    return grid, p
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,3 +1,27 @@
+import functools
+
+
+def derived(method):
+    '''(function) -> function
+
+    Return method, a GameState method taking no arguments, changed to
+    compute its result at most once per state, caching it in the state's
+    _derived dict. A state that changes in place, as push and pop do, must
+    start a new _derived dict, so nothing stale is returned.
+
+    The result is shared by every caller, and must not be changed.
+    '''
+    name = method.__name__
+
+    @functools.wraps(method)
+    def cached(self):
+        if name in self._derived:
+            return self._derived[name]
+        result = self._derived[name] = method(self)
+        return result
+    return cached
+
+
 class GameState:
     '''
     Snapshot of information between moves for a two-player, sequential move,
@@ -8,14 +32,24 @@ class GameState:
     next_player: str    -- player about to move, unless game is over
                            in which case it is the opponent of the player
                            who just moved
-    over: bool          -- flag indicating whether game is over
+    over: bool          -- flag indicating whether game is over, worked
+                           out by is_over when first needed
     instructions: str   -- description of what actions to take at each turn
     WIN: float          -- class constant indicating next player has won
     LOSE: float         -- class constant indicating next player has lost
     DRAW: float         -- class constant indicating next player tied
+    supports_push: bool -- class constant indicating whether push and pop
+                           are implemented
+    positional_moves: bool -- class constant indicating whether a move
+                           means much the same in every state it is legal
+                           in, such as a move naming a cell of a board, so a
+                           move that did well in one state is worth trying
+                           early in others
     '''
     # assign class constants
     WIN, LOSE, DRAW = 1.0, -1.0, 0.0
+    supports_push = False
+    positional_moves = False
 
     def __init__(self, p, interactive=False):
         '''(GameState, str, bool) -> NoneType
@@ -25,8 +59,35 @@ class GameState:
 
         prerequisite - p is in {'p1', 'p2'}
         '''
-        self.next_player, self.over = p, False
+        self.next_player = p
         self.instructions = 'Generic instructions --- fill in with subclass'
+        #Results of derived methods, computed when first needed.
+        self._derived = {}
+
+    @property
+    def over(self):
+        '''(GameState) -> bool
+
+        Return whether the game is over, as found by is_over.
+        '''
+        return self.is_over()
+
+    @over.setter
+    def over(self, value):
+        '''(GameState, bool) -> NoneType
+
+        Record whether the game is over, for subclasses that know it
+        without calling is_over.
+        '''
+        self._derived['is_over'] = value
+
+    @derived
+    def is_over(self):
+        '''(GameState) -> bool
+
+        Return whether the game is over.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
 
     def opponent(self):
         '''(GameState) -> str
@@ -42,6 +103,34 @@ class GameState:
         else:
             return 'p1'
 
+    def key(self):
+        '''(GameState) -> object
+
+        Return a hashable key identifying this GameState, for use by
+        strategies that cache scores. Equal states have equal keys.
+
+        Subclasses should override this with something cheaper to build
+        and hash than the default string representation.
+        '''
+        return self.__repr__()
+
+    def to_bytes(self):
+        '''(GameState) -> bytes
+
+        Return a compact encoding of this GameState, for sending to other
+        processes or storing, that from_bytes turns back into an equal
+        GameState.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''(type, bytes) -> GameState
+
+        Return the GameState encoded in data by to_bytes.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
     def get_move(self):
         '''(GameState) -> Move
 
@@ -49,11 +138,41 @@ class GameState:
         '''
         raise NotImplementedError('Implemented in a subclass')
 
-    def apply_move(self, move):
-        '''(GameState, Move) -> GameState
+    def is_legal(self, move):
+        '''(GameState, Move) -> bool
+
+        Return whether move is legal from state self.
+
+        Subclasses should override this with a check that does not build
+        every legal move.
+        '''
+        return move in self.possible_next_moves()
+
+    def apply_move(self, move, trusted=False):
+        '''(GameState, Move, bool) -> GameState
 
         Return the new game state reached by applying move to
         state self, or None if the move is illegal.
+
+        If trusted, move is known to be legal, for instance because it came
+        from possible_next_moves, and is not checked again.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    def push(self, move):
+        '''(GameState, Move) -> NoneType
+
+        Apply move to this GameState in place, so that it becomes the
+        state apply_move would return. Undo with pop.
+
+        Assume: move is legal
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    def pop(self):
+        '''(GameState) -> NoneType
+
+        Undo the most recent push that has not been undone yet.
         '''
         raise NotImplementedError('Method must be implemented in a subclass')
 
@@ -75,6 +194,65 @@ class GameState:
         '''
         raise NotImplementedError('Method must be implemented in a subclass')
 
+    def winning_moves(self, player):
+        ''' (GameState, str) -> list of Move
+
+        Return the legal moves from the present state with which player,
+        if it were their turn, would win at once. For the opponent of the
+        next player, these are the moves the next player may need to block.
+
+        Used to try the most forcing moves first; by default no moves are
+        known to win at once.
+        '''
+        return []
+
+    def distinct_next_moves(self):
+        ''' (GameState) -> list of Move
+
+        Return the legal moves from the present state, less any move
+        leading to a state that is a symmetric copy of the state reached
+        by an earlier move, and so has the same score.
+
+        Subclasses of games with symmetries should override this; by
+        default every legal move is returned.
+        '''
+        return self.possible_next_moves()
+
+    def canonical_move(self, move):
+        ''' (GameState, Move) -> Move
+
+        Return move as played from the orientation of the present state
+        that key() stands for, so that a move stored by key means the same
+        for every symmetric copy of the state.
+
+        Subclasses whose key() is the same for symmetric copies should
+        override this and move_from_canonical; by default move is returned.
+        '''
+        return move
+
+    def move_from_canonical(self, move):
+        ''' (GameState, Move) -> Move
+
+        Return the move from the present state that canonical_move turns
+        into move.
+        '''
+        return move
+
+    @derived
+    def winning_player(self):
+        ''' (GameState) -> str
+
+        Return the player who has won, 'p1' or 'p2', or None if neither
+        has, as found by winner.
+
+        self.over must be True.
+        '''
+        for player in ('p1', 'p2'):
+            if self.winner(player):
+                return player
+        return None
+
+    @derived
     def outcome(self):
         ''' (GameState) -> float
 
@@ -83,13 +261,23 @@ class GameState:
 
         self.over must be True.
         '''
-        if self.winner(self.next_player):
+        winner = self.winning_player()
+        if winner == self.next_player:
             return GameState.WIN
-        elif self.winner(self.opponent()):
+        elif winner is not None:
             return GameState.LOSE
         else:
             return GameState.DRAW
 
+    def known_outcome(self):
+        '''(GameState) -> float
+
+        Return the outcome for self.next_player with best play, in
+        {WIN, LOSE, DRAW}, if it is already known without searching, for
+        instance from a precomputed table, or None otherwise.
+        '''
+        return None
+
     def rough_outcome(self):
         '''(GameState) -> float
 
@@ -30,7 +30,7 @@ class GameView:
         while not self.state.over:
             if self.state.next_player == 'p1':
                 m = self.state.get_move()
-                while not m in self.state.possible_next_moves():
+                while not self.state.is_legal(m):
                     # The move was illegal.
                     print('Illegal move: {}\nPlease try again.\n'.format(m))
                     print(self.state.instructions)
@@ -56,6 +56,7 @@ class GameView:
 
 
 if __name__ == '__main__':    
+    import os
     from tippy_game_state import TippyGameState
     from subtract_square_state import SubtractSquareState
     game_state = ({'t': TippyGameState, 's': SubtractSquareState})
@@ -63,9 +64,24 @@ if __name__ == '__main__':
     from strategy_minimax import StrategyMinimax
     from strategy_minimax_memoize import StrategyMinimaxMemoize
     from strategy_minimax_prune import StrategyMinimaxPrune
+    from strategy_minimax_alphabeta import StrategyMinimaxAlphaBeta
+    from strategy_minimax_pvs import StrategyMinimaxPVS
+    from strategy_minimax_mtdf import StrategyMinimaxMTDF
+    from strategy_proof_number import StrategyProofNumber
+    from strategy_mcts import StrategyMCTS
+    from strategy_parallel import StrategyParallel
+    from strategy_lazy_smp import StrategyLazySMP
     from strategy_minimax_myopic import StrategyMinimaxMyopic
+    from persistent_cache import SQLiteCache
     strategy = ({'memoize': StrategyMinimaxMemoize, 
                  'prune': StrategyMinimaxPrune, 
+                 'alphabeta': StrategyMinimaxAlphaBeta, 
+                 'pvs': StrategyMinimaxPVS, 
+                 'mtdf': StrategyMinimaxMTDF, 
+                 'proof': StrategyProofNumber, 
+                 'mcts': StrategyMCTS, 
+                 'parallel': StrategyParallel, 
+                 'lazysmp': StrategyLazySMP, 
                 'myopic': StrategyMinimaxMyopic, 
                 'minimax': StrategyMinimax, 
                 'random': StrategyRandom})
@@ -74,6 +90,37 @@ if __name__ == '__main__':
         g = input('t to play Tippy, s for Subtract-A-Square: ')
     s = ''
     while not s in strategy.keys():
-        s = input('Enter random, minimax, '
-                  'memoize, prune or myopic for a strategy: ')
-    GameView(game_state[g], strategy[s]).play()
\ No newline at end of file
+        s = input('Enter random, minimax, memoize, prune, alphabeta, pvs, '
+                  'mtdf, proof, myopic, mcts, parallel or lazysmp for a '
+                  'strategy: ')
+    view = GameView(game_state[g], strategy[s])
+    if g == 't':
+        #Look endgames up in a tablebase for this grid size, if one was
+        #written by tippy_tablebase.py.
+        path = 'tippy_%d.tablebase' % len(view.state.grid)
+        if os.path.exists(path):
+            from tippy_tablebase import TippyTablebase
+            TippyGameState.outcome_table = TippyTablebase(path)
+    elif os.path.exists('subtract_square.table'):
+        #Look totals up in a table written by subtract_square_sieve.py.
+        from subtract_square_sieve import SubtractSquareTable
+        SubtractSquareState.outcome_table = SubtractSquareTable(
+            'subtract_square.table')
+    cache = None
+    if s == 'memoize':
+        #Keep memoized scores between runs, apart for each game and each
+        #grid size.
+        namespace = game_state[g].__name__
+        if g == 't':
+            namespace = '%s-%d' % (namespace, len(view.state.grid))
+        cache = SQLiteCache('minimax_cache.db', namespace)
+        view.strategy = StrategyMinimaxMemoize(cache=cache)
+    try:
+        view.play()
+    finally:
+        #Shut down worker processes and free shared memory, if any.
+        close = getattr(view.strategy, 'close', None)
+        if close is not None:
+            close()
+        if cache is not None:
+            cache.close()
\ No newline at end of file
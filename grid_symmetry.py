@@ -0,0 +1,95 @@
+from tippy_move import TippyMove
+
+
+class GridSymmetry:
+    '''The 8 rotations and reflections of a square grid of one dimension.
+
+    Built once per dimension. Cell (row, column), counting from 0, is cell
+    number row * dimension + column. The symmetries are listed in a fixed
+    order, the identity first, so the i-th image of every cell is under
+    the same symmetry.
+
+    dimension: int              -- number of rows (and columns) of the grid
+    images: list of tuple       -- for each cell number, the cell number it
+                                   is moved to by each symmetry
+    INVERSE: tuple of int       -- class constant, for each symmetry, the
+                                   number of the symmetry that undoes it
+    '''
+    # assign class constants
+    INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+    _symmetries = {}
+
+    def __init__(self, dimension):
+        '''(GridSymmetry, int) -> NoneType
+
+        Initialize the GridSymmetry of a dimension by dimension grid.
+
+        >>> GridSymmetry(3).images[0]
+        (0, 2, 8, 6, 2, 6, 0, 8)
+        >>> GridSymmetry(3).images[4]
+        (4, 4, 4, 4, 4, 4, 4, 4)
+        '''
+        self.dimension = dimension
+        last = dimension - 1
+        self.images = []
+        for r in range(dimension):
+            for c in range(dimension):
+                #Identity, the 3 rotations, then the 4 reflections.
+                cells = [(r, c), (c, last - r), (last - r, last - c),
+                         (last - c, r), (r, last - c), (last - r, c),
+                         (c, r), (last - c, last - r)]
+                self.images.append(tuple([row_num * dimension + column_num
+                                          for (row_num, column_num)
+                                          in cells]))
+
+    @classmethod
+    def for_dimension(cls, dimension):
+        '''(type, int) -> GridSymmetry
+
+        Return the shared GridSymmetry for a dimension by dimension grid,
+        building it the first time it is needed.
+
+        >>> GridSymmetry.for_dimension(4) is GridSymmetry.for_dimension(4)
+        True
+        '''
+        if dimension not in cls._symmetries:
+            cls._symmetries[dimension] = cls(dimension)
+        return cls._symmetries[dimension]
+
+    def transform_bits(self, bits):
+        '''(GridSymmetry, int) -> list of int
+
+        Return the image of bitboard bits under each symmetry.
+
+        >>> GridSymmetry(2).transform_bits(0b0011)
+        [3, 10, 12, 5, 3, 12, 5, 10]
+        '''
+        result = [0] * 8
+        while bits:
+            #Take the lowest set bit, then clear it.
+            low = bits & -bits
+            for i, image in enumerate(self.images[low.bit_length() - 1]):
+                result[i] |= 1 << image
+            bits ^= low
+        return result
+
+    def transform_move(self, move, symmetry):
+        '''(GridSymmetry, TippyMove, int) -> TippyMove
+
+        Return the image of move under the symmetry-th symmetry.
+
+        >>> from tippy_move import TippyMove
+        >>> GridSymmetry(3).transform_move(TippyMove(1, 1), 1)
+        TippyMove(3, 1)
+        >>> GridSymmetry(3).transform_move(TippyMove(3, 1),
+        ...                                GridSymmetry.INVERSE[1])
+        TippyMove(1, 1)
+        '''
+        cell = self.images[(move.y - 1) * self.dimension +
+                           move.x - 1][symmetry]
+        return TippyMove(cell % self.dimension + 1, cell // self.dimension + 1)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
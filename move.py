@@ -2,6 +2,24 @@ class Move:
 
     ''' A move in a two-player, sequential move,
     zero-sum, perfect-information game.
+
+    Subclasses are expected to be immutable and hashable, so moves can be
+    kept in sets and used as dict keys.
     '''
+    __slots__ = ()
+
+    def to_bytes(self):
+        '''(Move) -> bytes
+
+        Return a compact encoding of this Move, that from_bytes turns back
+        into an equal Move.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''(type, bytes) -> Move
 
-    # There is nothing to define here!
+        Return the Move encoded in data by to_bytes.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
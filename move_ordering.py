@@ -0,0 +1,118 @@
+class MoveOrderer:
+    '''Orders the moves of a GameState for a pruning search, most likely to
+    cause a cutoff first, so that the rest can be skipped sooner.
+
+    Moves that win at once come first, then moves that block an opponent's
+    win at once, then the best move a transposition table holds for the
+    state, then the killer moves of the ply: the moves that last caused a
+    cutoff at the same depth in another state. The remaining moves follow
+    by their history score, built up from the cutoffs they have caused
+    anywhere, keeping their own order between equal scores. A cutoff
+    closer to the root counts for more, as it saved a larger search.
+
+    Killer moves and history scores are only used for states with
+    positional_moves: elsewhere, what a move did in one state says little
+    about what it does in another.
+
+    One MoveOrderer is kept by each strategy for the life of the strategy,
+    and learns from the cutoffs the strategy reports with record_cutoff.
+
+    killers: list of list   -- for each ply, the last KILLERS moves to
+                               cause a cutoff there, newest first
+    history: dict           -- maps moves to their history score
+    KILLERS: int            -- class constant, number of killer moves kept
+                               per ply
+    HISTORY_PLIES: int      -- class constant, number of plies below the
+                               root over which the weight of a cutoff
+                               halves at each ply
+    '''
+    # assign class constants
+    KILLERS = 2
+    HISTORY_PLIES = 24
+
+    def __init__(self):
+        '''(MoveOrderer) -> NoneType
+
+        Initialize a MoveOrderer with no killer moves or history.
+        '''
+        self.killers, self.history = [], {}
+
+    def new_search(self):
+        '''(MoveOrderer) -> NoneType
+
+        Prepare for a search from a new state: forget the killer moves,
+        which belong to the plies of the last search, and halve the history
+        scores, so that recent cutoffs count for more.
+
+        >>> orderer = MoveOrderer()
+        >>> orderer.record_cutoff('a', 24)
+        >>> orderer.record_cutoff('b', 22)
+        >>> orderer.new_search()
+        >>> orderer.killers, orderer.history
+        ([], {'b': 2})
+        '''
+        self.killers = []
+        self.history = {move: score >> 1
+                        for move, score in self.history.items() if score > 1}
+
+    def record_cutoff(self, move, ply):
+        '''(MoveOrderer, Move, int) -> NoneType
+
+        Record that move caused a cutoff at ply.
+        '''
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[MoveOrderer.KILLERS:]
+        weight = 1 << max(0, MoveOrderer.HISTORY_PLIES - ply)
+        self.history[move] = self.history.get(move, 0) + weight
+
+    def order(self, state, moves=None, ply=0, table_move=None):
+        '''(MoveOrderer, GameState, list of Move, int, Move) -> list of Move
+
+        Return moves, or the legal moves from state if moves is None, in
+        the order to search them from state at ply. table_move is the best
+        move a transposition table holds for state, or None. A table_move
+        or killer move not among moves is left out.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> orderer = MoveOrderer()
+        >>> orderer.record_cutoff(TippyMove(2, 2), 3)
+        >>> t = TippyGameState('p2', grid=[['x', 'x', None],
+        ...                                [None, None, None],
+        ...                                [None, None, None]])
+        >>> orderer.order(t, ply=1)[:3]
+        [TippyMove(2, 2), TippyMove(3, 1), TippyMove(1, 2)]
+        '''
+        if moves is None:
+            moves = state.possible_next_moves()
+        if len(moves) < 2:
+            return moves
+
+        #The moves to try first, in order, without repeats.
+        first = dict.fromkeys(state.winning_moves(state.next_player))
+        first.update(dict.fromkeys(state.winning_moves(state.opponent())))
+        if table_move is not None:
+            first[table_move] = None
+        positional = state.positional_moves
+        if positional and ply < len(self.killers):
+            first.update(dict.fromkeys(self.killers[ply]))
+        if first:
+            legal = set(moves)
+            first = [move for move in first if move in legal]
+            rest = [move for move in moves if move not in first]
+        else:
+            first, rest = [], list(moves)
+
+        if positional and self.history:
+            #sort is stable, so equal scores keep their order.
+            rest.sort(key=lambda move: -self.history.get(move, 0))
+        return first + rest
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
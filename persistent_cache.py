@@ -0,0 +1,180 @@
+from bounded_cache import LRUCache
+import sqlite3
+
+
+def encode_key(key):
+    '''(object) -> bytes
+
+    Return a compact encoding of a state key, as stored on disk: bytes as
+    they are, ints as their two's complement bytes, strings as UTF-8, each
+    tagged with its type so the encodings of different types never clash.
+
+    >>> encode_key(b'\\x02\\x02\\x01')
+    b'b\\x02\\x02\\x01'
+    >>> encode_key(49)
+    b'i1'
+    >>> encode_key('abc')
+    b'sabc'
+    '''
+    if isinstance(key, bytes):
+        return b'b' + key
+    elif isinstance(key, int):
+        return b'i' + key.to_bytes(key.bit_length() // 8 + 1, 'little',
+                                   signed=True)
+    elif isinstance(key, str):
+        return b's' + key.encode()
+    return b'r' + repr(key).encode()
+
+
+class SQLiteCache:
+    '''A cache of searched scores kept in an SQLite file, so they survive
+    from one run to the next and can be shared by several processes.
+
+    Scores are stored by the encode_key of their key, under a namespace
+    telling apart the games sharing one file. Strategies look states up by
+    key_of, their to_bytes encoding, rather than by their key(): an
+    encoding names one state only, so no two states can share a score, and
+    it stays the same when key() changes. The namespace is stored with
+    FORMAT added, so rows written in an older format are never read.
+    Recently used
+    scores are also kept in memory. New scores are held back and written
+    to the file together by flush, which strategies call at the end of each
+    search, or once BATCH_SIZE of them are waiting. The file is opened in
+    write-ahead-log mode, so processes can read it while another writes.
+
+    path: str           -- path of the SQLite file
+    namespace: str      -- namespace of the scores in the file
+    hits: int           -- number of lookups that found their key
+    misses: int         -- number of lookups that did not
+    BATCH_SIZE: int     -- class constant, most scores held back from the
+                           file at once
+    FORMAT: int         -- class constant, version of the keys in the file;
+                           raise it whenever to_bytes or encode_key change
+    '''
+    # assign class constants
+    BATCH_SIZE = 1 << 16
+    FORMAT = 2
+
+    def __init__(self, path, namespace='', max_entries=1 << 20):
+        '''(SQLiteCache, str, str, int) -> NoneType
+
+        Open the SQLiteCache in the file at path, creating it if need be,
+        for the scores in namespace, keeping at most max_entries of them
+        in memory.
+        '''
+        self.path, self.namespace = path, namespace
+        self._stored_namespace = '%s/v%d' % (namespace, SQLiteCache.FORMAT)
+        self._max_entries = max_entries
+        self._memory = LRUCache(max_entries=max_entries)
+        self._pending = {}
+        self.hits, self.misses = 0, 0
+        self._connection = sqlite3.connect(path, timeout=30)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS scores ('
+            'namespace TEXT NOT NULL, key BLOB NOT NULL, score REAL NOT NULL, '
+            'PRIMARY KEY (namespace, key)) WITHOUT ROWID')
+        self._connection.commit()
+
+    def __getstate__(self):
+        '''(SQLiteCache) -> tuple
+
+        Return what another process needs to open this cache.
+        '''
+        return self.path, self.namespace, self._max_entries
+
+    def __setstate__(self, state):
+        '''(SQLiteCache, tuple) -> NoneType
+
+        Open the cache described by state.
+        '''
+        self.__init__(*state)
+
+    def key_of(self, state):
+        '''(SQLiteCache, GameState) -> bytes
+
+        Return the key the score of state is stored under.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> cache = SQLiteCache(':memory:')
+        >>> cache.key_of(SubtractSquareState('p2', current_total=100))
+        b'\\xc9\\x01'
+        '''
+        return state.to_bytes()
+
+    def get(self, key, default=None):
+        '''(SQLiteCache, object, object) -> float
+
+        Return the score for key, or default if there is none.
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'cache.db')
+        >>> cache = SQLiteCache(path, 'test')
+        >>> cache[49] = 1.0
+        >>> cache.flush()
+        >>> SQLiteCache(path, 'test').get(49)
+        1.0
+        >>> SQLiteCache(path, 'other').get(49) is None
+        True
+        '''
+        value = self._memory.get(key)
+        if value is None:
+            value = self._pending.get(key)
+        if value is None:
+            row = self._connection.execute(
+                'SELECT score FROM scores WHERE namespace = ? AND key = ?',
+                (self._stored_namespace, encode_key(key))).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            value = row[0]
+            self._memory[key] = value
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        '''(SQLiteCache, object, float) -> NoneType
+
+        Set the score for key, to be written to the file by the next flush.
+        '''
+        self._memory[key] = value
+        self._pending[key] = value
+        if len(self._pending) >= SQLiteCache.BATCH_SIZE:
+            self.flush()
+
+    def __len__(self):
+        '''(SQLiteCache) -> int
+
+        Return the number of scores in the file for this namespace, not
+        counting those not flushed yet.
+        '''
+        return self._connection.execute(
+            'SELECT COUNT(*) FROM scores WHERE namespace = ?',
+            (self._stored_namespace,)).fetchone()[0]
+
+    def flush(self):
+        '''(SQLiteCache) -> NoneType
+
+        Write the scores set since the last flush to the file, in one
+        transaction.
+        '''
+        if self._pending:
+            with self._connection:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO scores VALUES (?, ?, ?)',
+                    [(self._stored_namespace, encode_key(key), value)
+                     for key, value in self._pending.items()])
+            self._pending = {}
+
+    def close(self):
+        '''(SQLiteCache) -> NoneType
+
+        Flush the cache and close the file.
+        '''
+        self.flush()
+        self._connection.close()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
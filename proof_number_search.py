@@ -0,0 +1,237 @@
+from game_state import GameState
+
+
+class _ProofNode:
+    '''A node of a proof-number search tree: the state reached by playing
+    move from the state of parent.
+
+    The proof number of a node is the least number of unsolved leaves
+    that must be proven wins for the attacker to prove the node a win, and
+    the disproof number the least that must be disproven to disprove it.
+    A proven node has proof number 0, and a disproven one disproof number
+    0; the other number is then INFINITY.
+
+    move: Move              -- move leading here, or None at the root
+    parent: _ProofNode      -- node this one was expanded from, or None
+    key: object             -- key of the state of this node
+    attacking: bool         -- whether the attacker is to move here
+    proof: float            -- proof number
+    disproof: float         -- disproof number
+    children: list of _ProofNode -- nodes expanded from this one, or None
+                                    if not expanded or solved
+    '''
+    __slots__ = ('move', 'parent', 'key', 'attacking', 'proof', 'disproof',
+                 'children')
+
+    def __init__(self, move, parent, key, attacking):
+        '''(_ProofNode, Move, _ProofNode, object, bool) -> NoneType
+
+        Initialize an unexpanded _ProofNode, with proof and disproof
+        numbers of 1.
+        '''
+        self.move, self.parent, self.key = move, parent, key
+        self.attacking = attacking
+        self.proof, self.disproof = 1, 1
+        self.children = None
+
+    def most_proving_child(self):
+        '''(_ProofNode) -> _ProofNode
+
+        Return the child to search further: the one with the least proof
+        number if the attacker is to move, or else the least disproof
+        number.
+        '''
+        if self.attacking:
+            return min(self.children, key=lambda c: c.proof)
+        return min(self.children, key=lambda c: c.disproof)
+
+    def update(self):
+        '''(_ProofNode) -> bool
+
+        Set the proof and disproof numbers of this expanded node from its
+        children, and return whether either changed.
+        '''
+        proofs = [child.proof for child in self.children]
+        disproofs = [child.disproof for child in self.children]
+        if self.attacking:
+            proof, disproof = min(proofs), sum(disproofs)
+        else:
+            proof, disproof = sum(proofs), min(disproofs)
+        changed = (proof, disproof) != (self.proof, self.disproof)
+        self.proof, self.disproof = proof, disproof
+        return changed
+
+
+class ProofNumberSearch:
+    '''A solver for whether the player to move in a GameState can force a
+    win, by proof-number search.
+
+    The search grows a tree best first: each step expands the most proving
+    node, the leaf whose solution would do most towards proving or
+    disproving the root, as counted by the proof and disproof numbers of
+    the nodes on the way. Narrow questions like this are often settled
+    after a small part of the tree an alpha-beta search would visit.
+
+    The attacker is the player to move at the root. A tie, like a loss,
+    disproves a win. A leaf is solved at once if the game is over there,
+    its known_outcome is known, or the player to move has a winning move.
+    Otherwise its numbers start from the number of its moves, so that
+    narrow lines are tried first. Solved subtrees are dropped, keeping
+    only the root's children, so memory follows the unsolved part of the
+    tree, but whether the state of each solved node is a win is kept by
+    its key for the rest of the search, so a state reached again by other
+    moves is solved at once.
+
+    max_nodes: int      -- most nodes created per search
+    nodes: int          -- number of nodes created by the last search
+    INFINITY: float     -- class constant, proof or disproof number of a
+                           node that cannot be proven or disproven
+    '''
+    # assign class constants
+    INFINITY = float('inf')
+
+    def __init__(self, max_nodes=1 << 18):
+        '''(ProofNumberSearch, int) -> NoneType
+
+        Initialize a ProofNumberSearch creating at most max_nodes nodes
+        per search.
+        '''
+        self.max_nodes = max_nodes
+        self.nodes, self._solved = 0, {}
+
+    def solve(self, state):
+        '''(ProofNumberSearch, GameState) -> tuple of (bool, Move)
+
+        Return (True, move) if state.next_player can force a win from
+        state by playing move, (False, None) if they cannot, or
+        (None, None) if that is not settled within max_nodes nodes.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> solver = ProofNumberSearch()
+        >>> solver.solve(SubtractSquareState('p1', current_total=29))
+        (True, SubtractSquareMove(9))
+        >>> solver.solve(SubtractSquareState('p1', current_total=34))
+        (False, None)
+        >>> ProofNumberSearch(10).solve(
+        ...     SubtractSquareState('p1', current_total=1000))
+        (None, None)
+        '''
+        self.nodes, self._solved = 0, {}
+        if state.over:
+            return False, None
+        attacker = state.next_player
+        root = _ProofNode(None, None, state.key(), True)
+        self._expand(root, state, attacker, state.distinct_next_moves())
+        root.update()
+
+        while (root.proof and root.disproof and
+               self.nodes < self.max_nodes):
+            #Replay the moves down to the most proving node.
+            node, current, pushed = root, state, 0
+            try:
+                while node.children is not None:
+                    node = node.most_proving_child()
+                    current = self._play(current, node.move)
+                    pushed += 1
+                self._expand(node, current, attacker,
+                             current.possible_next_moves())
+            finally:
+                if state.supports_push:
+                    for i in range(pushed):
+                        state.pop()
+            self._update_ancestors(node)
+
+        if root.proof == 0:
+            for child in root.children:
+                if child.proof == 0:
+                    return True, child.move
+        elif root.disproof == 0:
+            return False, None
+        return None, None
+
+    def _play(self, state, move):
+        '''(ProofNumberSearch, GameState, Move) -> GameState
+
+        Return the state reached by playing move from state, pushing it
+        onto state if state supports push.
+        '''
+        if state.supports_push:
+            state.push(move)
+            return state
+        return state.apply_move(move, trusted=True)
+
+    def _expand(self, node, state, attacker, moves):
+        '''(ProofNumberSearch, _ProofNode, GameState, str, list of Move)
+            -> NoneType
+
+        Add a child to node, whose state is state, for each of moves, and
+        set the numbers of each child. Stop early once one child settles
+        node.
+        '''
+        node.children = []
+        for move in moves:
+            new_state = self._play(state, move)
+            child = _ProofNode(move, node, new_state.key(), None)
+            try:
+                self._evaluate(child, new_state, attacker)
+            finally:
+                if state.supports_push:
+                    state.pop()
+            node.children.append(child)
+            self.nodes += 1
+            #One win for the player to move settles node.
+            settled = (child.proof == 0 if node.attacking
+                       else child.disproof == 0)
+            if settled:
+                break
+
+    def _evaluate(self, node, state, attacker):
+        '''(ProofNumberSearch, _ProofNode, GameState, str) -> NoneType
+
+        Set whether the attacker is to move at unexpanded node, whose state
+        is state, and its proof and disproof numbers.
+        '''
+        node.attacking = state.next_player == attacker
+        won = self._solved.get(node.key)
+        if won is None:
+            if state.over:
+                outcome = state.outcome()
+            else:
+                outcome = state.known_outcome()
+                if (outcome is None and
+                        state.winning_moves(state.next_player)):
+                    outcome = GameState.WIN
+            if outcome is not None:
+                #outcome is for the player to move.
+                won = outcome == (GameState.WIN if node.attacking
+                                  else GameState.LOSE)
+
+        if won is None:
+            if node.attacking:
+                node.disproof = len(state.possible_next_moves())
+            else:
+                node.proof = len(state.possible_next_moves())
+        elif won:
+            node.proof, node.disproof = 0, ProofNumberSearch.INFINITY
+        else:
+            node.proof, node.disproof = ProofNumberSearch.INFINITY, 0
+
+    def _update_ancestors(self, node):
+        '''(ProofNumberSearch, _ProofNode) -> NoneType
+
+        Update the numbers of node, just expanded, and of its ancestors in
+        turn, stopping at the first whose numbers are unchanged. Record
+        each node that is now solved, and drop its children unless it is
+        the root.
+        '''
+        while node is not None and node.update():
+            if not (node.proof and node.disproof):
+                self._solved[node.key] = node.proof == 0
+                if node.parent is not None:
+                    node.children = None
+            node = node.parent
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,184 @@
+from transposition_table import TranspositionTable, TableEntry
+from multiprocessing import shared_memory
+import hashlib
+
+
+MASK64 = (1 << 64) - 1
+
+
+def hash64(key):
+    '''(object) -> int
+
+    Return a 64-bit hash of a state key that is the same in every process:
+    ints are folded to 64 bits and mixed, anything else is hashed by its
+    string representation.
+
+    >>> hash64(12345) == hash64(12345)
+    True
+    >>> 0 <= hash64('abc') <= MASK64
+    True
+    '''
+    if isinstance(key, int):
+        h = 0
+        while True:
+            h ^= key & MASK64
+            key >>= 64
+            if not key:
+                break
+        #Finalizer of splitmix64, so that nearby ints spread out.
+        h = (h ^ (h >> 30)) * 0xbf58476d1ce4e5b9 & MASK64
+        h = (h ^ (h >> 27)) * 0x94d049bb133111eb & MASK64
+        return h ^ (h >> 31)
+    return int.from_bytes(hashlib.blake2b(str(key).encode(),
+                                          digest_size=8).digest(), 'little')
+
+
+class SharedTranspositionTable(TranspositionTable):
+    '''A fixed-size TranspositionTable kept in shared memory, so several
+    search processes can probe and store into the same table without
+    locks.
+
+    Each entry is one 64-bit word: bits 0-1 hold the score + 1, bits 2-3
+    the bound type, bit 4 marks the word as used, bits 8-15 the depth and
+    bits 16-63 the top 48 bits of the key's hash64. Words are read and
+    written whole, and a word only counts for a key when its hash bits
+    match, so a racing write at worst loses an entry.
+
+    Entries live in buckets of two words, chosen by the low bits of the
+    hash. The first word of a bucket keeps the deepest entry stored there,
+    the second the most recent of the rest.
+
+    Scores must be in {LOSE, DRAW, WIN} and depths at most FULL_DEPTH.
+    Best moves are not kept: get always reports the move as None.
+
+    size: int   -- number of buckets, a power of 2
+    name: str   -- name of the shared memory block
+    '''
+
+    def __init__(self, size=1 << 20, name=None):
+        '''(SharedTranspositionTable, int, str) -> NoneType
+
+        Create an empty SharedTranspositionTable of size buckets, or attach
+        to the existing one called name.
+
+        Assume: size is a power of 2
+        '''
+        self.size, self.name = size, name
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True,
+                                                      size=16 * size)
+            self.name = self._memory.name
+        else:
+            self._memory = shared_memory.SharedMemory(name=name)
+        self._words = self._memory.buf.cast('Q')
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __getstate__(self):
+        '''(SharedTranspositionTable) -> tuple
+
+        Return what another process needs to attach to this table.
+        '''
+        return self.size, self.name
+
+    def __setstate__(self, state):
+        '''(SharedTranspositionTable, tuple) -> NoneType
+
+        Attach to the table described by state.
+        '''
+        self.__init__(*state)
+
+    def __len__(self):
+        '''(SharedTranspositionTable) -> int
+
+        Return the number of stored entries.
+        '''
+        return sum([1 for word in self._words if word & 16])
+
+    def __del__(self):
+        '''(SharedTranspositionTable) -> NoneType
+
+        Release the view of the shared memory, so that it can be closed
+        even if close was never called, or if __init__ failed before the
+        view was made.
+        '''
+        words = getattr(self, '_words', None)
+        if words is not None:
+            words.release()
+
+    def close(self):
+        '''(SharedTranspositionTable) -> NoneType
+
+        Detach this process from the table.
+        '''
+        self._words.release()
+        self._memory.close()
+
+    def unlink(self):
+        '''(SharedTranspositionTable) -> NoneType
+
+        Free the shared memory, once every process has closed it.
+        '''
+        self._memory.unlink()
+
+    def get(self, key):
+        '''(SharedTranspositionTable, object) -> TableEntry
+
+        Return the entry stored for key, or None.
+
+        >>> table = SharedTranspositionTable(4)
+        >>> table.store(7, 1.0, TranspositionTable.LOWER, 3)
+        >>> table.get(7)
+        TableEntry(score=1.0, flag=1, depth=3, move=None)
+        >>> table.get(8) is None
+        True
+        >>> table.close(); table.unlink()
+        '''
+        h = hash64(key)
+        index = 2 * (h & (self.size - 1))
+        check = h >> 16
+        for word in (self._words[index], self._words[index + 1]):
+            if word & 16 and word >> 16 == check:
+                return TableEntry(float((word & 3) - 1), word >> 2 & 3,
+                                  word >> 8 & 255, None)
+        return None
+
+    def store(self, key, score, flag, depth, move=None):
+        '''(SharedTranspositionTable, object, float, int, int, Move)
+            -> NoneType
+
+        Record score with bound type flag for key, searched to depth. move
+        is ignored.
+
+        >>> table = SharedTranspositionTable(1)
+        >>> table.store(1, 0.0, TranspositionTable.EXACT, 5)
+        >>> table.store(2, -1.0, TranspositionTable.EXACT, 2)
+        >>> table.store(3, 1.0, TranspositionTable.EXACT, 1)
+        >>> table.get(1).depth, table.get(2), table.get(3).depth
+        (5, None, 1)
+        >>> table.close(); table.unlink()
+        '''
+        h = hash64(key)
+        index = 2 * (h & (self.size - 1))
+        check = h >> 16
+        depth = min(depth, TranspositionTable.FULL_DEPTH)
+        word = (check << 16 | depth << 8 | 16 | flag << 2 |
+                int(score) + 1)
+
+        deepest, recent = self._words[index], self._words[index + 1]
+        if deepest >> 16 == check or not deepest & 16:
+            #Same key, or an empty word: only keep the deeper search.
+            if depth >= deepest >> 8 & 255 or not deepest & 16:
+                self._words[index] = word
+            return
+        if recent & 16 and recent >> 16 != check:
+            self.evictions += 1
+        if depth >= deepest >> 8 & 255:
+            self._words[index + 1] = deepest
+            self._words[index] = word
+        else:
+            self._words[index + 1] = word
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,9 +1,27 @@
+import time
+
+
+class SearchAborted(Exception):
+    '''Raised inside a search that has to stop before it finishes.
+    '''
+
+
 class Strategy:
     '''Interface to suggest moves for a GameState.
 
     Must be subclassed to a concrete strategy.  Our intention is
     to provide a uniform interface for functions that suggest moves.
+
+    nodes: int          -- number of game states visited through
+                           _children so far
+    deadline: float     -- time.monotonic() value at which a search through
+                           _children stops by raising SearchAborted, or None
+    stop_event: Event   -- multiprocessing.Event which, once set, stops a
+                           search through _children by raising
+                           SearchAborted, or None
     '''
+    nodes = 0
+    deadline, stop_event = None, None
 
     def __init__(self, interactive=False):
         '''(Strategy, bool) -> NoneType
@@ -17,3 +35,59 @@ class Strategy:
         Suggest a next move for state.
         '''
         raise NotImplementedError('Must be implemented in subclass')
+
+    def _score_child(self, new_state):
+        '''(Strategy, GameState) -> float
+
+        Return the score of new_state, reached by one move from the state a
+        move is being suggested for, for the player who made that move.
+
+        Implemented by strategies that score moves by search, so that
+        several processes can share out the moves of one state.
+        '''
+        raise NotImplementedError('Must be implemented in subclass')
+
+    def _children(self, state, moves=None):
+        '''(Strategy, GameState, list of Move) -> generator
+
+        Yield (move, new_state) for each move in moves, or each legal move
+        from state if moves is None, where new_state is the state move
+        leads to.
+
+        If state supports push, new_state is state itself with move pushed,
+        and move is popped again before the next pair is yielded, so
+        new_state must not be kept or changed. Otherwise new_state is a new
+        GameState from apply_move. Either way moves are trusted to be legal
+        and are not checked.
+
+        Raise SearchAborted if self.deadline has passed or self.stop_event
+        is set.
+        '''
+        if moves is None:
+            moves = state.possible_next_moves()
+        if state.supports_push:
+            for move in moves:
+                self._check_stop()
+                state.push(move)
+                try:
+                    yield move, state
+                finally:
+                    state.pop()
+        else:
+            for move in moves:
+                self._check_stop()
+                yield move, state.apply_move(move, trusted=True)
+
+    def _check_stop(self):
+        '''(Strategy) -> NoneType
+
+        Count one more node, and raise SearchAborted if self.deadline has
+        passed or self.stop_event is set. The event is only checked every
+        1024 nodes, as that needs a lock.
+        '''
+        self.nodes += 1
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise SearchAborted('Search ran out of time.')
+        if (self.stop_event is not None and not self.nodes & 1023 and
+                self.stop_event.is_set()):
+            raise SearchAborted('Search was stopped.')
@@ -0,0 +1,145 @@
+from strategy import Strategy, SearchAborted
+from strategy_minimax_alphabeta import StrategyMinimaxAlphaBeta
+from shared_transposition_table import SharedTranspositionTable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import random
+
+
+# The strategy each worker process searches with, set up by _init_worker.
+_worker_strategy = None
+
+
+def _init_worker(table, stop_event):
+    '''(SharedTranspositionTable, Event) -> NoneType
+
+    Set up a worker process to search with alpha-beta over the shared
+    table, stopping once stop_event is set.
+    '''
+    global _worker_strategy
+    _worker_strategy = StrategyMinimaxAlphaBeta(table=table)
+    _worker_strategy.stop_event = stop_event
+
+
+def _search(cls, data, seed):
+    '''(type, bytes, int) -> tuple of (bool, int, int)
+
+    Search the state of class cls encoded as data by to_bytes, trying its
+    moves in an order shuffled by seed, or in their usual order if seed is
+    0. Return whether the search finished, the index of the best move
+    found or None if every move loses, and the number of nodes searched.
+    '''
+    state = cls.from_bytes(data)
+    moves = state.distinct_next_moves()
+    order = list(range(len(moves)))
+    if seed:
+        random.Random(seed).shuffle(order)
+
+    _worker_strategy.orderer.new_search()
+    nodes = _worker_strategy.nodes
+    try:
+        move = _worker_strategy._best_move(state, [moves[i] for i in order])
+    except SearchAborted:
+        return False, None, _worker_strategy.nodes - nodes
+    index = None if move is None else moves.index(move)
+    return True, index, _worker_strategy.nodes - nodes
+
+
+class StrategyLazySMP(Strategy):
+    '''A strategy that runs the same alpha-beta search in several worker
+    processes at once, all sharing one SharedTranspositionTable (Lazy
+    SMP).
+
+    Each worker tries the moves of the state in a different order, so the
+    workers soon search different parts of the tree, and each one finds
+    the results of the others in the shared table. The first worker to
+    finish supplies the move, and the others are stopped.
+
+    workers: int                        -- number of worker processes
+    table: SharedTranspositionTable     -- table shared by the workers, or
+                                           None until first needed
+    nodes: int                          -- number of game states the
+                                           workers visited for the last
+                                           suggested move, added up
+    '''
+
+    def __init__(self, interactive=False, workers=None, table_size=1 << 20):
+        '''(StrategyLazySMP, bool, int, int) -> NoneType
+
+        Initialize a StrategyLazySMP with workers processes, or one per CPU
+        if workers is None, sharing a table of table_size buckets.
+        Processes are only started when first needed.
+        '''
+        self.workers = workers or multiprocessing.cpu_count()
+        self.table, self._table_size = None, table_size
+        self.nodes = 0
+        self._executor, self._stop_event = None, None
+
+    def close(self):
+        '''(StrategyLazySMP) -> NoneType
+
+        Shut down the worker processes and free the shared table, if they
+        were started. Closing again does nothing.
+
+        >>> s = StrategyLazySMP(workers=2, table_size=1 << 10)
+        >>> s.table is None
+        True
+        >>> s.close(); s.close()
+        '''
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor, self._stop_event = None, None
+        if self.table is not None:
+            self.table.close()
+            self.table.unlink()
+            self.table = None
+
+    def suggest_move(self, state):
+        '''(StrategyLazySMP, GameState) -> Move
+
+        Return a move that takes the computer to a winnable game state.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyLazySMP(workers=2, table_size=1 << 10)
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=28))
+        SubtractSquareMove(16)
+        >>> s.close(); s.close()
+        '''
+        #Should not ask Minimax to suggest a move on a finished game.
+        if state.over:
+            raise Exception("Cannot suggest a move, game is over.")
+
+        if self._executor is None:
+            if self.table is None:
+                self.table = SharedTranspositionTable(self._table_size)
+            self._stop_event = multiprocessing.Event()
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker,
+                initargs=(self.table, self._stop_event))
+
+        possible_moves = state.distinct_next_moves()
+        data = state.to_bytes()
+        futures = [self._executor.submit(_search, type(state), data, seed)
+                   for seed in range(self.workers)]
+
+        self.nodes, best_index, found = 0, None, False
+        try:
+            for future in as_completed(futures):
+                finished, index, nodes = future.result()
+                self.nodes += nodes
+                if finished and not found:
+                    #The first search to finish stops the others.
+                    best_index, found = index, True
+                    self._stop_event.set()
+        finally:
+            self._stop_event.clear()
+
+        if best_index is not None:
+            return possible_moves[best_index]
+        else:
+            return random.choice(possible_moves)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
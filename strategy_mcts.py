@@ -0,0 +1,163 @@
+from strategy import Strategy
+from game_state import GameState
+from math import log, sqrt
+import random
+import time
+
+
+class _Node:
+    '''A node of a Monte Carlo search tree: the state reached by playing
+    move from the state of parent.
+
+    move: Move              -- move leading here, or None at the root
+    parent: _Node           -- node this one was expanded from, or None
+    player: str             -- player who played move
+    untried: list of Move   -- legal moves not expanded into children yet
+    children: list of _Node -- nodes expanded from this one
+    visits: int             -- number of playouts through this node
+    reward: float           -- total reward of those playouts for player:
+                               1 for a win, 0.5 for a tie, 0 for a loss
+    '''
+
+    def __init__(self, move, parent, player, untried):
+        '''(_Node, Move, _Node, str, list of Move) -> NoneType
+
+        Initialize a _Node with no playouts yet.
+        '''
+        self.move, self.parent, self.player = move, parent, player
+        self.untried, self.children = untried, []
+        self.visits, self.reward = 0, 0.0
+
+    def select(self, exploration):
+        '''(_Node, float) -> _Node
+
+        Return the child with the highest upper confidence bound (UCT).
+        '''
+        log_visits = log(self.visits)
+        return max(self.children,
+                   key=lambda c: (c.reward / c.visits +
+                                  exploration * sqrt(log_visits / c.visits)))
+
+
+class StrategyMCTS(Strategy):
+    '''A strategy that picks the move most explored by Monte Carlo Tree
+    Search.
+
+    Each playout descends the tree by UCT selection, expands one untried
+    move, plays random moves to the end of the game, and credits the
+    result to every node on the way. Search stops after playouts playouts,
+    or once time_limit seconds have passed, whichever comes first, so it
+    can answer within a fixed time on any size of grid.
+
+    playouts: int       -- maximum number of playouts per suggested move
+    time_limit: float   -- maximum seconds per suggested move, or None
+    exploration: float  -- UCT exploration constant
+    '''
+
+    def __init__(self, interactive=False, playouts=1000, time_limit=None,
+                 exploration=sqrt(2)):
+        '''(StrategyMCTS, bool, int, float, float) -> NoneType
+
+        Initialize a StrategyMCTS with a playout and time budget.
+        '''
+        self.playouts = playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+
+    def _play(self, state, move):
+        '''(StrategyMCTS, GameState, Move) -> GameState
+
+        Return the state reached by playing move from state, pushing it
+        onto state if state supports push.
+        '''
+        if state.supports_push:
+            state.push(move)
+            return state
+        return state.apply_move(move, trusted=True)
+
+    def _playout(self, root, state):
+        '''(StrategyMCTS, _Node, GameState) -> NoneType
+
+        Run one playout from root, whose state is state.
+        '''
+        node, pushed = root, 0
+        try:
+            #Select a path of fully expanded nodes.
+            while not node.untried and node.children:
+                node = node.select(self.exploration)
+                state = self._play(state, node.move)
+                pushed += 1
+
+            #Expand one untried move.
+            if node.untried:
+                move = node.untried.pop(
+                    random.randrange(len(node.untried)))
+                player = state.next_player
+                state = self._play(state, move)
+                pushed += 1
+                child = _Node(move, node, player,
+                              [] if state.over
+                              else list(state.possible_next_moves()))
+                node.children.append(child)
+                node = child
+
+            #Play at random to the end of the game.
+            outcome = state.known_outcome()
+            while outcome is None and not state.over:
+                state = self._play(state,
+                                   random.choice(state.possible_next_moves()))
+                pushed += 1
+                outcome = state.known_outcome()
+            if outcome is None:
+                outcome = state.outcome()
+            winner = None
+            if outcome == GameState.WIN:
+                winner = state.next_player
+            elif outcome == GameState.LOSE:
+                winner = state.opponent()
+        finally:
+            if state.supports_push:
+                for i in range(pushed):
+                    state.pop()
+
+        #Credit the result to each node on the path.
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.reward += 0.5
+            elif winner == node.player:
+                node.reward += 1.0
+            node = node.parent
+
+    def suggest_move(self, state):
+        '''(StrategyMCTS, GameState) -> Move
+
+        Return the move explored most by Monte Carlo Tree Search.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMCTS(playouts=500)
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=16))
+        SubtractSquareMove(16)
+        '''
+        #Should not ask for a move on a finished game.
+        if state.over:
+            raise Exception("Cannot suggest a move, game is over.")
+
+        root = _Node(None, None, state.opponent(),
+                     list(state.distinct_next_moves()))
+        deadline = None
+        if self.time_limit is not None:
+            deadline = time.monotonic() + self.time_limit
+        for i in range(self.playouts):
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            self._playout(root, state)
+
+        if not root.children:
+            return random.choice(state.possible_next_moves())
+        return max(root.children, key=lambda c: c.visits).move
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,5 @@
 from strategy import Strategy
+from move_ordering import MoveOrderer
 import random
 
 
@@ -28,9 +29,19 @@ class StrategyMinimax(Strategy):
         '''
         if state.over:
             return -1 * state.outcome()
+        known = state.known_outcome()
+        if known is not None:
+            return -1 * known
         else:
-            return min([-1 * self._get_score(state.apply_move(move)) 
-                        for move in state.possible_next_moves()])  
+            return min([-1 * self._get_score(new_state) 
+                        for move, new_state in self._children(state)])  
+
+    def _score_child(self, new_state):
+        '''(StrategyMinimax, GameState) -> float
+
+        Return the score of new_state for the player who just moved.
+        '''
+        return self._get_score(new_state)
 
     def suggest_move(self, state):
         '''(StrategyMinimax, GameState) --> Move
@@ -53,13 +64,13 @@ class StrategyMinimax(Strategy):
         if state.over:
             raise Exception("Cannot suggest a move, game is over.")
 
-        possible_moves = state.possible_next_moves()
+        #Moves that win at once first, as the first win found is taken.
+        possible_moves = MoveOrderer().order(state,
+                                             state.distinct_next_moves())
         
         suggested_move = None
         # Consider every possible move ...
-        for move in possible_moves:
-            new_state = state.apply_move(move)
-    
+        for move, new_state in self._children(state, possible_moves):
             score = self._get_score(new_state)
     
             if score == 1:
@@ -0,0 +1,179 @@
+from strategy import Strategy
+from game_state import GameState
+from transposition_table import TranspositionTable
+from move_ordering import MoveOrderer
+import random
+
+
+class StrategyMinimaxAlphaBeta(Strategy):
+    '''A strategy that picks a move which leads to a winnable game state.
+
+    Searches the game tree with negamax alpha-beta: every call carries a
+    full (alpha, beta) window, and the remaining moves of a state are
+    skipped as soon as alpha >= beta. Scores are kept as exact values or
+    bounds in a TranspositionTable, so states reached by different move
+    orders are searched once. Moves are searched in the order given by a
+    MoveOrderer, which learns from every cutoff.
+
+    nodes: int                  -- number of game states visited by the
+                                   last suggest_move
+    table: TranspositionTable   -- scores of states searched so far
+    orderer: MoveOrderer        -- order to search moves in
+    NULL_WINDOW: float          -- class constant, width of a null window:
+                                   less than the gap between two scores
+    '''
+    # assign class constants
+    NULL_WINDOW = 0.5
+
+    def __init__(self, interactive=False, table=None):
+        '''(StrategyMinimaxAlphaBeta, bool, TranspositionTable) -> NoneType
+
+        Initialize a StrategyMinimaxAlphaBeta instance with table, or a new
+        TranspositionTable if table is None.
+        '''
+        if table is None:
+            table = TranspositionTable()
+        self.table = table
+        self.orderer = MoveOrderer()
+
+    def _get_score(self, state, alpha, beta, ply=0):
+        '''(StrategyMinimaxAlphaBeta, GameState, float, float, int) -> float
+
+        Return the score of state for state.next_player, searched within
+        the window (alpha, beta), ply moves below the state a move is being
+        suggested for.
+
+        A score for a GameState is:
+        1.0 if winnable
+        0.0 if only tieable
+        -1.0 if only losable
+
+        A score strictly inside the window is exact. A score <= alpha
+        only says the true score is at most that value, and a score >= beta
+        only says the true score is at least that value.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxAlphaBeta()
+        >>> t = SubtractSquareState('p1', current_total=16)
+        >>> s._get_score(t, -1.0, 1.0)
+        1.0
+        >>> t = SubtractSquareState('p1', current_total=2)
+        >>> s._get_score(t, -1.0, 1.0)
+        -1.0
+        '''
+        key = state.key()
+        #Check if state has already been searched deep enough.
+        entry = self.table.get(key)
+        score = self.table.probe_entry(entry, TranspositionTable.FULL_DEPTH,
+                                       alpha, beta)
+        if score is not None:
+            return score
+
+        if state.over:
+            result = state.outcome()
+        else:
+            result = state.known_outcome()
+        if result is not None:
+            self.table.store(key, result, TranspositionTable.EXACT,
+                             TranspositionTable.FULL_DEPTH)
+            return result
+
+        #Try the best move found for state before, if any, early. It is
+        #stored as played from the orientation key stands for.
+        table_move = None
+        if entry is not None and entry.move is not None:
+            table_move = state.move_from_canonical(entry.move)
+        moves = self.orderer.order(state, state.possible_next_moves(), ply,
+                                   table_move)
+        alpha_orig = alpha
+        best, best_move = GameState.LOSE, None
+        for index, (move, new_state) in enumerate(self._children(state,
+                                                                 moves)):
+            score = self._search_child(new_state, alpha, beta, ply + 1,
+                                       index == 0)
+            if score > best:
+                best, best_move = score, move
+                if best > alpha:
+                    alpha = best
+                    #The opponent will never allow this line: cut off.
+                    if alpha >= beta:
+                        self.orderer.record_cutoff(move, ply)
+                        break
+
+        #Cache the score, with the bound it is known to within.
+        if best_move is not None:
+            best_move = state.canonical_move(best_move)
+        self.table.store(key, best,
+                         self.table.bound_type(best, alpha_orig, beta),
+                         TranspositionTable.FULL_DEPTH, best_move)
+        return best
+
+    def _search_child(self, new_state, alpha, beta, ply, first):
+        '''(StrategyMinimaxAlphaBeta, GameState, float, float, int, bool)
+            -> float
+
+        Return the score of new_state, ply moves below the state a move is
+        being suggested for, for the player who moved to it from a state
+        searched within the window (alpha, beta). first is whether it is
+        the first move searched from that state.
+
+        Every move is searched with the full window here; subclasses may
+        search some with a narrower one.
+        '''
+        return -1 * self._get_score(new_state, -beta, -alpha, ply)
+
+    def _score_child(self, new_state):
+        '''(StrategyMinimaxAlphaBeta, GameState) -> float
+
+        Return the score of new_state for the player who just moved.
+        '''
+        return -1 * self._get_score(new_state, GameState.LOSE, GameState.WIN,
+                                    1)
+
+    def suggest_move(self, state):
+        '''(StrategyMinimaxAlphaBeta, GameState) -> Move
+
+        Return a move that takes the computer to a winnable game state.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxAlphaBeta()
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=18))
+        SubtractSquareMove(16)
+        '''
+        #Should not ask Minimax to suggest a move on a finished game.
+        if state.over:
+            raise Exception("Cannot suggest a move, game is over.")
+
+        self.nodes = 0
+        self.orderer.new_search()
+        possible_moves = self.orderer.order(state, state.distinct_next_moves())
+
+        best_move = self._best_move(state, possible_moves)
+        if best_move is not None:
+            return best_move
+        else:
+            return random.choice(possible_moves)
+
+    def _best_move(self, state, moves):
+        '''(StrategyMinimaxAlphaBeta, GameState, list of Move) -> Move
+
+        Return the first of moves from state that wins, or else the first
+        that ties, or None if every move loses.
+        '''
+        alpha, best_move = GameState.LOSE, None
+        for index, (move, new_state) in enumerate(self._children(state,
+                                                                 moves)):
+            score = self._search_child(new_state, alpha, GameState.WIN, 1,
+                                       index == 0)
+            #Return the first winning move.
+            if score == GameState.WIN:
+                return move
+            #Remember the first move that beats the current best.
+            elif score > alpha:
+                alpha, best_move = score, move
+        return best_move
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,4 +1,5 @@
 from strategy import Strategy
+from bounded_cache import LRUCache
 import random
 
 
@@ -7,14 +8,32 @@ class StrategyMinimaxMemoize(Strategy):
     state. 
     
     Optimizes speed by avoiding redundant computations.
+
+    states_dict: LRUCache   -- scores of computed GameStates, by key, or by
+                               the cache's key_of if it has one
+    MAX_ENTRIES: int        -- class constant, default bound on the number
+                               of cached scores
     '''
-    def __init__(self):
-        '''(StrategyMinimaxMemoize) -> NoneType
+    # assign class constants
+    MAX_ENTRIES = 1 << 20
+
+    def __init__(self, interactive=False, cache=None):
+        '''(StrategyMinimaxMemoize, bool, LRUCache) -> NoneType
         
         Initialize a StrategyMinimaxMemoize instance with a states_dict 
-        dictionary of computed GameStates.
+        cache of computed GameStates: cache, such as an LRUCache, a
+        SQLiteCache or a dict, or a new LRUCache of MAX_ENTRIES entries if
+        cache is None.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxMemoize(cache={})
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=18))
+        SubtractSquareMove(16)
         '''
-        self.states_dict = {}
+        if cache is None:
+            cache = LRUCache(max_entries=StrategyMinimaxMemoize.MAX_ENTRIES)
+        self.states_dict = cache
+        self._key_of = getattr(cache, 'key_of', None)
     
     def _get_score(self, state):
         '''(StrategyMinimaxMemoize, GameState) -> float
@@ -34,25 +53,36 @@ class StrategyMinimaxMemoize(Strategy):
         >>> s._get_score(t)
         1.0
         '''
-        s = state.__repr__()
+        s = state.key() if self._key_of is None else self._key_of(state)
         #Check if state has already been computed.
-        if(s in self.states_dict):
-            return self.states_dict[s]
+        result = self.states_dict.get(s)
+        if result is not None:
+            return result
         
         if state.over:
             result = -1 * state.outcome()
             #Cache the computed score.
             self.states_dict[s] = result
             return result
+        known = state.known_outcome()
+        if known is not None:
+            return -1 * known
         
         #Simulate Minimax's opponent...
-        result = min([-1 * self._get_score(state.apply_move(move)) 
-                      for move in state.possible_next_moves()])
+        result = min([-1 * self._get_score(new_state) 
+                      for move, new_state in self._children(state)])
         
         #Cache the computed score.
         self.states_dict[s] = result      
         return result
 
+    def _score_child(self, new_state):
+        '''(StrategyMinimaxMemoize, GameState) -> float
+
+        Return the score of new_state for the player who just moved.
+        '''
+        return self._get_score(new_state)
+
     def suggest_move(self, state):
         '''(StrategyMinimaxMemoize, GameState) -> Move
         
@@ -76,19 +106,24 @@ class StrategyMinimaxMemoize(Strategy):
         if state.over:
             raise Exception("Cannot suggest a move, game is over.")
 
-        possible_moves = state.possible_next_moves()
+        possible_moves = state.distinct_next_moves()
         
         tie_move = None
-        #Score the resultant states of all possible moves...
-        for move in possible_moves:
-            new_state = state.apply_move(move)
-            score = self._get_score(new_state)
-            #Return the first winning move.
-            if score == 1:
-                return move
-            #Remember the first tying move.
-            elif score == 0:
-                tie_move = move
+        try:
+            #Score the resultant states of all possible moves...
+            for move, new_state in self._children(state, possible_moves):
+                score = self._get_score(new_state)
+                #Return the first winning move.
+                if score == 1:
+                    return move
+                #Remember the first tying move.
+                elif score == 0:
+                    tie_move = move
+        finally:
+            #Write back the scores of this search, if the cache holds any.
+            flush = getattr(self.states_dict, 'flush', None)
+            if flush is not None:
+                flush()
              
         if tie_move is not None:
             return tie_move
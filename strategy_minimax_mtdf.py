@@ -0,0 +1,129 @@
+from strategy_minimax_alphabeta import StrategyMinimaxAlphaBeta
+from game_state import GameState
+from transposition_table import TranspositionTable
+
+
+class StrategyMinimaxMTDF(StrategyMinimaxAlphaBeta):
+    '''A strategy that picks a move which leads to a winnable game state.
+
+    Finds the score of a state with MTD(f): a sequence of alpha-beta
+    searches with null windows, each asking only whether the score is above
+    or below a guess and narrowing the bounds on it, until they meet. Every
+    pass reuses the scores and best moves the passes before left in the
+    TranspositionTable, so only the part of the tree the new window needs
+    is searched again.
+
+    With only LOSE, DRAW and WIN as scores, a first guess of DRAW settles
+    the score in at most two passes.
+
+    nodes: int                  -- number of game states visited by the
+                                   last suggest_move
+    passes: int                 -- number of null window searches made by
+                                   the last suggest_move
+    table: TranspositionTable   -- scores of states searched so far
+    orderer: MoveOrderer        -- order to search moves in
+    '''
+
+    def __init__(self, interactive=False, table=None):
+        '''(StrategyMinimaxMTDF, bool, TranspositionTable) -> NoneType
+
+        Initialize a StrategyMinimaxMTDF instance with table, or a new
+        TranspositionTable if table is None.
+        '''
+        StrategyMinimaxAlphaBeta.__init__(self, interactive, table)
+        self.passes = 0
+
+    def _mtdf(self, state, guess, ply=0):
+        '''(StrategyMinimaxMTDF, GameState, float, int) -> float
+
+        Return the score of state for state.next_player, ply moves below
+        the state a move is being suggested for, by null window searches
+        starting from guess.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxMTDF()
+        >>> s._mtdf(SubtractSquareState('p1', current_total=16),
+        ...         GameState.DRAW)
+        1.0
+        >>> s._mtdf(SubtractSquareState('p1', current_total=2),
+        ...         GameState.DRAW)
+        -1.0
+        '''
+        null_window = StrategyMinimaxAlphaBeta.NULL_WINDOW
+        lower, upper = GameState.LOSE, GameState.WIN
+        score = guess
+        while lower < upper:
+            #Ask whether the score is at least beta.
+            if score == lower:
+                beta = score + null_window
+            else:
+                beta = score
+            score = self._get_score(state, beta - null_window, beta, ply)
+            self.passes += 1
+            if score < beta:
+                upper = score
+            else:
+                lower = score
+        return score
+
+    def _score_child(self, new_state):
+        '''(StrategyMinimaxMTDF, GameState) -> float
+
+        Return the score of new_state for the player who just moved.
+        '''
+        return -1 * self._mtdf(new_state, GameState.DRAW, 1)
+
+    def suggest_move(self, state):
+        '''(StrategyMinimaxMTDF, GameState) -> Move
+
+        Return a move that takes the computer to a winnable game state.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxMTDF()
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=18))
+        SubtractSquareMove(16)
+        >>> s.passes
+        1
+        '''
+        self.passes = 0
+        return StrategyMinimaxAlphaBeta.suggest_move(self, state)
+
+    def _best_move(self, state, moves):
+        '''(StrategyMinimaxMTDF, GameState, list of Move) -> Move
+
+        Return the first of moves from state that wins, or else the first
+        that ties, or None if every move loses.
+
+        The score of state is found first, then each move is only asked,
+        with a null window, whether it reaches that score.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxMTDF()
+        >>> t = TippyGameState('p1', grid=[[None] * 3 for i in range(3)])
+        >>> s._best_move(t, t.possible_next_moves()) is not None
+        True
+        >>> t = SubtractSquareState('p1', current_total=18)
+        >>> s._best_move(t, t.possible_next_moves())
+        SubtractSquareMove(16)
+        '''
+        #Start from the score of a full search before, if there was one.
+        entry = self.table.get(state.key())
+        if entry is None or entry.depth != TranspositionTable.FULL_DEPTH:
+            guess = GameState.DRAW
+        else:
+            guess = entry.score
+        score = self._mtdf(state, guess)
+        if score == GameState.LOSE:
+            return None
+        null_window = StrategyMinimaxAlphaBeta.NULL_WINDOW
+        for move, new_state in self._children(state, moves):
+            if -1 * self._get_score(new_state, -score, -score + null_window,
+                                    1) >= score:
+                return move
+        return None
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
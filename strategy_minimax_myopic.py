@@ -1,5 +1,7 @@
-from strategy import Strategy
+from strategy import Strategy, SearchAborted
+from transposition_table import TranspositionTable
 import random
+import time
 
 
 class StrategyMinimaxMyopic(Strategy):
@@ -8,26 +10,44 @@ class StrategyMinimaxMyopic(Strategy):
     
     Will return a rough estimate of GameState's score after limit number of
     moves-ahead are examined.
+
+    Scores are cached in a TranspositionTable together with the number of
+    moves-ahead they were searched to, so a cached score is only reused
+    when it was searched at least as deep as needed.
+
+    Given a time_limit, limit is ignored: moves are searched 1, 2, 3, ...
+    moves-ahead in turn until time_limit seconds have passed, and the best
+    move of the last search to finish is suggested.
     '''
-    def __init__(self, interactive=False, limit=3):
-        '''(StrategyMinimaxMyopic, bool, int) -> NoneType
+    def __init__(self, interactive=False, limit=3, table=None,
+                 time_limit=None):
+        '''(StrategyMinimaxMyopic, bool, int, TranspositionTable, float)
+            -> NoneType
         
         Initialize a StrategyMinimaxMyopic instance with a bool for user 
         interactive, and a limit number of moves before a move is suggested
-        based on a rough outcome.
+        based on a rough outcome. Use table to cache scores, or a new
+        TranspositionTable if table is None. If time_limit is not None,
+        deepen the search until time_limit seconds have passed instead.
         
         >>> s = StrategyMinimaxMyopic()
         NoneType
         '''
         self.limit = limit
+        if table is None:
+            table = TranspositionTable()
+        self.table = table
+        self.time_limit = time_limit
+        #Whether the search in progress used a rough outcome.
+        self._cut_off = False
     
-    def _get_score(self, state, moves_count=0):
-        '''(StrategyMinimaxMyopic, GameState, int) -> float
+    def _get_score(self, state, moves_count=0, limit=None):
+        '''(StrategyMinimaxMyopic, GameState, int, int) -> float
         
         Return the score of a state.
         
         Use state's rough outcome if moves_count (number of moves ahead 
-        examined) exceeds self.limit.
+        examined) exceeds limit, or self.limit if limit is None.
         
         A score for a GameState is:
         1.0 if winnable
@@ -45,14 +65,77 @@ class StrategyMinimaxMyopic(Strategy):
         >>> s._get_score(t)
         -1.0
         '''
+        if limit is None:
+            limit = self.limit
         if state.over:
             return -1 * state.outcome()
-        elif moves_count >= self.limit:
+        known = state.known_outcome()
+        if known is not None:
+            return -1 * known
+        elif moves_count >= limit:
+            self._cut_off = True
             return -1 * state.rough_outcome()
+
+        #The table holds scores for the player about to move.
+        depth = limit - moves_count
+        key = state.key()
+        score = self.table.probe(key, depth, state.LOSE, state.WIN)
+        if score is not None:
+            if self.table.get(key).depth < TranspositionTable.FULL_DEPTH:
+                self._cut_off = True
+            return -1 * score
         
-        return min([-1 * self._get_score(state.apply_move(move), 
-                                         moves_count + 1) 
-                    for move in state.possible_next_moves()])
+        cut_off, self._cut_off = self._cut_off, False
+        result = min([-1 * self._get_score(new_state, moves_count + 1, 
+                                           limit) 
+                      for move, new_state in self._children(state)])
+
+        #A score found without rough outcomes holds at any depth.
+        if not self._cut_off:
+            depth = TranspositionTable.FULL_DEPTH
+        self._cut_off = self._cut_off or cut_off
+
+        #Cache the computed score.
+        self.table.store(key, -1 * result, TranspositionTable.EXACT, depth)
+        return result
+
+    def _deepen(self, state, moves):
+        '''(StrategyMinimaxMyopic, GameState, list of Move) -> Move
+
+        Return the best of moves from state, searching 1, 2, 3, ... moves
+        ahead until self.time_limit seconds have passed or a search needs
+        no rough outcome. Each search tries moves in order of the scores
+        from the one before, and the best move of the last search to
+        finish is returned, or the first of moves if none finished.
+        '''
+        self.deadline = time.monotonic() + self.time_limit
+        best_move, limit = moves[0], 0
+        try:
+            while True:
+                self._cut_off = False
+                scores = []
+                for move, new_state in self._children(state, moves):
+                    scores.append(self._get_score(new_state, 0, limit))
+
+                #Order moves best first, ties in their previous order.
+                order = sorted(range(len(moves)), key=lambda i: -scores[i])
+                moves = [moves[i] for i in order]
+                best_move = moves[0]
+                if not self._cut_off:
+                    break
+                limit += 1
+        except SearchAborted:
+            pass
+        finally:
+            self.deadline = None
+        return best_move
+
+    def _score_child(self, new_state):
+        '''(StrategyMinimaxMyopic, GameState) -> float
+
+        Return the score of new_state for the player who just moved.
+        '''
+        return self._get_score(new_state)
 
     def suggest_move(self, state):
         '''(StrategyMinimaxMyopic, GameState) -> Move
@@ -74,12 +157,13 @@ class StrategyMinimaxMyopic(Strategy):
         if state.over:
             raise Exception("Cannot suggest a move, game is over.")
 
-        possible_moves = state.possible_next_moves()
+        possible_moves = state.distinct_next_moves()
+        if self.time_limit is not None:
+            return self._deepen(state, possible_moves)
         
         tie_move = None
         #Score the resultant GameState for all possible moves...
-        for move in possible_moves:
-            new_state = state.apply_move(move)
+        for move, new_state in self._children(state, possible_moves):
             score = self._get_score(new_state)
             #Return the first winning move.
             if score == 1:
@@ -1,4 +1,5 @@
 from strategy import Strategy
+from move_ordering import MoveOrderer
 import random
 
 
@@ -6,12 +7,26 @@ class StrategyMinimaxPrune(Strategy):
     '''A strategy that picks a move which leads to a winnable game state. 
     
     Includes a pruning optimization to avoid unnecessary computations.
+    Moves are searched in the order given by a MoveOrderer, so that the
+    pruning comes sooner.
+
+    nodes: int              -- number of game states visited by the last
+                               suggest_move
+    orderer: MoveOrderer    -- order to search moves in
     '''
-    
-    def _get_score(self, state, c, bound):
-        '''(StrategyMinimaxPrune, GameState, float, float) -> float
+
+    def __init__(self, interactive=False):
+        '''(StrategyMinimaxPrune, bool) -> NoneType
+
+        Initialize a StrategyMinimaxPrune instance with a new MoveOrderer.
+        '''
+        self.orderer = MoveOrderer()
+
+    def _get_score(self, state, c, bound, ply=0):
+        '''(StrategyMinimaxPrune, GameState, float, float, int) -> float
         
-        Return the score of a state, limited by bound.
+        Return the score of a state, limited by bound, ply moves below the
+        state a move is being suggested for.
         
         A score for a GameState is:
         1.0 if winnable
@@ -32,26 +47,30 @@ class StrategyMinimaxPrune(Strategy):
         '''
         if state.over:
             return c * state.outcome()
+        known = state.known_outcome()
+        if known is not None:
+            return c * known
         
         #Return value will be at most or at least this value...
         guarantee = -1 * c
         
         scores_list = []
         
-        for move in state.possible_next_moves():
-            new_state = state.apply_move(move)
-            
-            score = self._get_score(new_state, c * -1, guarantee)
+        moves = self.orderer.order(state, state.possible_next_moves(), ply)
+        for move, new_state in self._children(state, moves):
+            score = self._get_score(new_state, c * -1, guarantee, ply + 1)
             
             #Pruning, from p2's vantage...
             if c == 1:
                 guarantee = max(float(guarantee), score)
                 if guarantee >= bound:
+                    self.orderer.record_cutoff(move, ply)
                     return bound
             #Pruning, from p1's vantage...
             elif c == -1:
                 guarantee = min(float(guarantee), score)
                 if guarantee <= bound:
+                    self.orderer.record_cutoff(move, ply)
                     return bound
                 
             scores_list.append(guarantee)
@@ -61,6 +80,13 @@ class StrategyMinimaxPrune(Strategy):
         elif c == -1:
             return min(scores_list)  
 
+    def _score_child(self, new_state):
+        '''(StrategyMinimaxPrune, GameState) -> float
+
+        Return the score of new_state for the player who just moved.
+        '''
+        return self._get_score(new_state, -1, -1.0, 1)
+
     def suggest_move(self, state):
         '''(StrategyMinimaxPrune, GameState) -> Move
         
@@ -82,15 +108,15 @@ class StrategyMinimaxPrune(Strategy):
         if state.over:
             raise Exception("Cannot suggest a move, game is over.")
 
-        possible_moves = state.possible_next_moves()
+        self.nodes = 0
+        self.orderer.new_search()
+        possible_moves = self.orderer.order(state, state.distinct_next_moves())
         
         tie_move = None
         # Consider every possible move ...
-        for move in possible_moves:
-            # Apply the move
-            new_state = state.apply_move(move)
+        for move, new_state in self._children(state, possible_moves):
             # Get the score of the new state
-            score = self._get_score(new_state, -1, -1.0)
+            score = self._get_score(new_state, -1, -1.0, 1)
             
             if score == 1.0:
                 return move
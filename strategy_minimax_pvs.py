@@ -0,0 +1,73 @@
+from strategy_minimax_alphabeta import StrategyMinimaxAlphaBeta
+
+
+class StrategyMinimaxPVS(StrategyMinimaxAlphaBeta):
+    '''A strategy that picks a move which leads to a winnable game state.
+
+    Searches the game tree with principal variation search (NegaScout):
+    the first move of each state, the best by the move ordering, is
+    searched with the full (alpha, beta) window, and every other move only
+    with a null window just above alpha, which asks whether the move beats
+    alpha at all. A move that does is searched again with the full window,
+    to find out by how much.
+
+    With only LOSE, DRAW and WIN as scores, a null window search settles
+    most moves: a move that beats a DRAW is a WIN, so the search again is
+    only needed when alpha is LOSE and beta WIN.
+
+    nodes: int                  -- number of game states visited by the
+                                   last suggest_move
+    researches: int             -- number of moves searched again with the
+                                   full window by the last suggest_move
+    table: TranspositionTable   -- scores of states searched so far
+    orderer: MoveOrderer        -- order to search moves in
+    '''
+
+    def __init__(self, interactive=False, table=None):
+        '''(StrategyMinimaxPVS, bool, TranspositionTable) -> NoneType
+
+        Initialize a StrategyMinimaxPVS instance with table, or a new
+        TranspositionTable if table is None.
+        '''
+        StrategyMinimaxAlphaBeta.__init__(self, interactive, table)
+        self.researches = 0
+
+    def _search_child(self, new_state, alpha, beta, ply, first):
+        '''(StrategyMinimaxPVS, GameState, float, float, int, bool) -> float
+
+        Return the score of new_state, ply moves below the state a move is
+        being suggested for, for the player who moved to it from a state
+        searched within the window (alpha, beta). The first move from that
+        state is searched with the full window, and any other with a null
+        window above alpha, then again with the full window only if it
+        beats alpha without reaching beta.
+        '''
+        if first:
+            return -1 * self._get_score(new_state, -beta, -alpha, ply)
+        null_window = StrategyMinimaxAlphaBeta.NULL_WINDOW
+        score = -1 * self._get_score(new_state, -alpha - null_window, -alpha,
+                                     ply)
+        if alpha < score < beta:
+            self.researches += 1
+            score = -1 * self._get_score(new_state, -beta, -alpha, ply)
+        return score
+
+    def suggest_move(self, state):
+        '''(StrategyMinimaxPVS, GameState) -> Move
+
+        Return a move that takes the computer to a winnable game state.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyMinimaxPVS()
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=18))
+        SubtractSquareMove(16)
+        >>> s.nodes > 0
+        True
+        '''
+        self.researches = 0
+        return StrategyMinimaxAlphaBeta.suggest_move(self, state)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
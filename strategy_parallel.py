@@ -0,0 +1,141 @@
+from strategy import Strategy, SearchAborted
+from strategy_minimax_alphabeta import StrategyMinimaxAlphaBeta
+from game_state import GameState
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+import random
+
+
+# The strategy each worker process searches with, and the last state
+# it decoded, set up by _init_worker.
+_worker_strategy = None
+_worker_state = (None, None)
+
+
+def _init_worker(strategy, stop_event):
+    '''(callable, Event) -> NoneType
+
+    Set up a worker process to search with a new strategy(), which stops
+    once stop_event is set.
+    '''
+    global _worker_strategy
+    _worker_strategy = strategy()
+    _worker_strategy.stop_event = stop_event
+
+
+def _score_move(cls, data, index):
+    '''(type, bytes, int) -> tuple of (int, float, int)
+
+    Return index, the score of the index-th legal move from the state of
+    class cls encoded as data by to_bytes for the player making it, and
+    the number of nodes searched. The score is None if the search was
+    stopped.
+    '''
+    global _worker_state
+    if _worker_state[0] != data:
+        _worker_state = (data, cls.from_bytes(data))
+    state = _worker_state[1]
+    move = state.distinct_next_moves()[index]
+
+    nodes = _worker_strategy.nodes
+    try:
+        score = _worker_strategy._score_child(
+            state.apply_move(move, trusted=True))
+    except SearchAborted:
+        score = None
+    return index, score, _worker_strategy.nodes - nodes
+
+
+class StrategyParallel(Strategy):
+    '''A strategy that scores the moves of a state in parallel, one move
+    per task, across a pool of worker processes.
+
+    Each worker searches with its own instance of a minimax strategy, kept
+    between moves so its caches stay warm. The state is sent to the
+    workers once per suggested move, encoded by to_bytes, and each task
+    names a move by its index. As soon as one move is found to win, the
+    tasks not yet started are cancelled and the running ones are stopped.
+
+    strategy: callable  -- picklable callable, such as a Strategy class,
+                           returning the strategy each worker searches with
+    workers: int        -- number of worker processes
+    nodes: int          -- number of game states the workers visited for
+                           the last suggested move, added up
+    '''
+
+    def __init__(self, interactive=False, strategy=StrategyMinimaxAlphaBeta,
+                 workers=None):
+        '''(StrategyParallel, bool, callable, int) -> NoneType
+
+        Initialize a StrategyParallel searching with strategy in workers
+        processes, or one per CPU if workers is None. Processes are only
+        started when first needed.
+        '''
+        self.strategy = strategy
+        self.workers = workers or multiprocessing.cpu_count()
+        self.nodes = 0
+        self._executor, self._stop_event = None, None
+
+    def close(self):
+        '''(StrategyParallel) -> NoneType
+
+        Shut down the worker processes.
+        '''
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor, self._stop_event = None, None
+
+    def suggest_move(self, state):
+        '''(StrategyParallel, GameState) -> Move
+
+        Return a move that takes the computer to a winnable game state.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyParallel(workers=2)
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=18))
+        SubtractSquareMove(16)
+        >>> s.close()
+        '''
+        #Should not ask Minimax to suggest a move on a finished game.
+        if state.over:
+            raise Exception("Cannot suggest a move, game is over.")
+
+        if self._executor is None:
+            self._stop_event = multiprocessing.Event()
+            self._executor = ProcessPoolExecutor(
+                self.workers, initializer=_init_worker,
+                initargs=(self.strategy, self._stop_event))
+
+        possible_moves = state.distinct_next_moves()
+        data = state.to_bytes()
+        futures = [self._executor.submit(_score_move, type(state), data, i)
+                   for i in range(len(possible_moves))]
+
+        self.nodes, scores = 0, {}
+        try:
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                index, score, nodes = future.result()
+                self.nodes += nodes
+                if score is not None:
+                    scores[index] = score
+                if score == GameState.WIN and not self._stop_event.is_set():
+                    #A winning move: stop every other search.
+                    self._stop_event.set()
+                    for other in futures:
+                        other.cancel()
+        finally:
+            self._stop_event.clear()
+
+        #Return a winning move, or else the first tying move.
+        for wanted in (GameState.WIN, GameState.DRAW):
+            for index in sorted(scores):
+                if scores[index] == wanted:
+                    return possible_moves[index]
+        return random.choice(possible_moves)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
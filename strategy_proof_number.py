@@ -0,0 +1,61 @@
+from strategy import Strategy
+from strategy_mcts import StrategyMCTS
+from proof_number_search import ProofNumberSearch
+
+
+class StrategyProofNumber(Strategy):
+    '''A strategy that plays a move proven by proof-number search to force
+    a win, and otherwise the move suggested by a fallback strategy.
+
+    The fallback is asked both when the search proves there is no forced
+    win, and when it is not settled within the node budget.
+
+    solver: ProofNumberSearch   -- search for a forced win
+    fallback: Strategy          -- strategy to ask when no win is proven
+    proven: bool                -- whether the last search proved a win
+                                   (True), proved there is none (False) or
+                                   was not settled (None)
+    nodes: int                  -- number of nodes created by the last
+                                   search
+    '''
+
+    def __init__(self, interactive=False, fallback=None, max_nodes=1 << 18):
+        '''(StrategyProofNumber, bool, Strategy, int) -> NoneType
+
+        Initialize a StrategyProofNumber searching at most max_nodes nodes
+        per move, falling back to fallback, or to a new StrategyMCTS if
+        fallback is None.
+        '''
+        if fallback is None:
+            fallback = StrategyMCTS()
+        self.solver = ProofNumberSearch(max_nodes)
+        self.fallback = fallback
+        self.proven = None
+
+    def suggest_move(self, state):
+        '''(StrategyProofNumber, GameState) -> Move
+
+        Return a move that forces a win from state, if one is proven, or
+        else the move fallback suggests.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = StrategyProofNumber()
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=29))
+        SubtractSquareMove(9)
+        >>> s.proven
+        True
+        '''
+        #Should not ask for a move on a finished game.
+        if state.over:
+            raise Exception("Cannot suggest a move, game is over.")
+
+        self.proven, move = self.solver.solve(state)
+        self.nodes = self.solver.nodes
+        if self.proven:
+            return move
+        return self.fallback.suggest_move(state)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
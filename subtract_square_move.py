@@ -1,21 +1,50 @@
 from move import Move
+from encoding import encode_varint, decode_varint
 
 
 class SubtractSquareMove(Move):
     ''' A move in the game of Subtract Square.
 
+    SubtractSquareMoves are immutable and interned: there is only ever one
+    SubtractSquareMove for each amount, so equal moves are the same object.
+
     amount: int -- amount to subtract from current value.
     '''
+    __slots__ = ('amount',)
+    _moves = {}
 
-    def __init__(self, amount):
-        ''' (SubtractSquareMove, int) -> NoneType
+    def __new__(cls, amount):
+        ''' (type, int) -> SubtractSquareMove
 
-        Initialize a new SubtractSquareMove for removing amount from value.
+        Return the SubtractSquareMove for removing amount from value.
 
         Assume: amount is a positive integer square.
+
+        >>> SubtractSquareMove(4) is SubtractSquareMove(4)
+        True
         '''
         #in Tippy, this would be an x,y  coordinate
-        self.amount = amount
+        move = cls._moves.get(amount)
+        if move is None:
+            move = object.__new__(cls)
+            object.__setattr__(move, 'amount', amount)
+            cls._moves[amount] = move
+        return move
+
+    def __setattr__(self, name, value):
+        ''' (SubtractSquareMove, str, object) -> NoneType
+
+        Refuse to change this SubtractSquareMove, which may be shared.
+        '''
+        raise Exception("SubtractSquareMove is immutable")
+
+    def __reduce__(self):
+        ''' (SubtractSquareMove) -> tuple
+
+        Return how to rebuild this SubtractSquareMove, as the interned
+        SubtractSquareMove with the same amount.
+        '''
+        return SubtractSquareMove, (self.amount,)
 
     def __repr__(self):
         ''' (SubtractSquareMove) -> str
@@ -50,8 +79,36 @@ class SubtractSquareMove(Move):
         >>> print(m1 == m2)
         False
         '''
-        return (isinstance(other, SubtractSquareMove) and 
-                self.amount == other.amount)
+        return self is other or (isinstance(other, SubtractSquareMove) and
+                                 self.amount == other.amount)
+
+    def __hash__(self):
+        ''' (SubtractSquareMove) -> int
+
+        Return a hash of this SubtractSquareMove, the same for equal moves.
+        '''
+        return hash(self.amount)
+
+    def to_bytes(self):
+        ''' (SubtractSquareMove) -> bytes
+
+        Return this SubtractSquareMove encoded as a varint of amount.
+
+        >>> SubtractSquareMove(144).to_bytes()
+        b'\\x90\\x01'
+        '''
+        return encode_varint(self.amount)
+
+    @classmethod
+    def from_bytes(cls, data):
+        ''' (type, bytes) -> SubtractSquareMove
+
+        Return the SubtractSquareMove encoded in data by to_bytes.
+
+        >>> SubtractSquareMove.from_bytes(b'\\x90\\x01')
+        SubtractSquareMove(144)
+        '''
+        return cls(decode_varint(data)[0])
 
 
 if __name__ == '__main__':
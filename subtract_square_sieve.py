@@ -0,0 +1,147 @@
+import numpy as np
+
+
+class SubtractSquareTable:
+    '''A read-only, memory-mapped table of the losing totals of
+    Subtract-a-Square, written by sieve.
+
+    The file holds the largest total n as 8 little-endian bytes, followed
+    by one bit per total 0..n, least significant bit first, set iff the
+    player about to move from that total loses.
+
+    Set SubtractSquareState.outcome_table to a SubtractSquareTable to have
+    known_outcome look totals up in it. game_view loads the table in
+    subtract_square.table, if there is one. Write it from the command
+    line, for instance:
+
+        python subtract_square_sieve.py subtract_square.table 100000000
+
+    limit: int              -- largest total in the table
+    bits: numpy.memmap      -- the packed bits, mapped read-only
+    '''
+
+    def __init__(self, path):
+        '''(SubtractSquareTable, str) -> NoneType
+
+        Open the table written by sieve to path.
+        '''
+        with open(path, 'rb') as f:
+            self.limit = int.from_bytes(f.read(8), 'little')
+        self.bits = np.memmap(path, dtype=np.uint8, mode='r', offset=8,
+                              shape=((self.limit + 8) // 8,))
+
+    def __contains__(self, total):
+        '''(SubtractSquareTable, int) -> bool
+
+        Return whether total is covered by the table.
+        '''
+        return 0 <= total <= self.limit
+
+    def is_losing(self, total):
+        '''(SubtractSquareTable, int) -> bool
+
+        Return whether the player about to move from total loses.
+
+        Assume: total in self
+        '''
+        return bool(self.bits[total >> 3] >> (total & 7) & 1)
+
+
+def sieve(path, n, chunk_size=1 << 16, batch_size=1 << 20):
+    '''(str, int, int, int) -> SubtractSquareTable
+
+    Compute which totals 0..n are losing for the player about to move, write
+    them to path as a SubtractSquareTable, and return it.
+
+    Totals are settled a chunk of chunk_size at a time, so the working set
+    stays in cache and memory stays bounded: only the losing totals, which
+    are sparse, are kept in memory, and finished chunks are streamed to the
+    memory-mapped file. A total is won iff it is a square above a losing
+    total. For each square, the losing totals of earlier chunks that it
+    lifts into the chunk are found with one vectorised binary search and
+    marked as a shifted array operation, at most batch_size marks at a
+    time. The totals left unmarked are then settled in order, lowest
+    first, marking the chunk a small square above each new losing total.
+
+    chunk_size is rounded up to a multiple of 8, so that every chunk but
+    the last fills whole bytes of the file.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'sieve.bin')
+    >>> table = sieve(path, 100, chunk_size=16)
+    >>> [n for n in range(20) if table.is_losing(n)]
+    [0, 2, 5, 7, 10, 12, 15, 17]
+    >>> 100 in table, 101 in table
+    (True, False)
+    >>> table = sieve(path, 1000, chunk_size=97)
+    >>> [n for n in range(20) if table.is_losing(n)]
+    [0, 2, 5, 7, 10, 12, 15, 17]
+    '''
+    chunk_size = (chunk_size + 7) // 8 * 8
+    with open(path, 'wb') as f:
+        f.write(n.to_bytes(8, 'little'))
+        f.truncate(8 + (n + 8) // 8)
+    bits = np.memmap(path, dtype=np.uint8, mode='r+', offset=8,
+                     shape=((n + 8) // 8,))
+
+    squares = np.arange(1, int(np.sqrt(n)) + 2, dtype=np.int64) ** 2
+    squares = squares[squares <= n]
+    #Losing totals found so far, in a buffer doubled as needed.
+    losing, count = np.zeros(1024, dtype=np.int64), 0
+
+    for lo in range(0, n + 1, chunk_size):
+        hi = min(lo + chunk_size, n + 1)
+        won = np.zeros(hi - lo, dtype=bool)
+
+        #Squares above earlier losing totals p, with lo <= p + s < hi.
+        found = losing[:count]
+        lifted = squares[squares < hi]
+        first = np.searchsorted(found, lo - lifted)
+        counts = np.searchsorted(found, hi - lifted) - first
+        ends = np.cumsum(counts)
+        start = 0
+        while start < len(lifted):
+            #Take as many squares as fit in one batch of marks.
+            stop = max(int(np.searchsorted(ends, (ends[start] - counts[start]
+                                                  + batch_size),
+                                           side='right')), start + 1)
+            batch = counts[start:stop]
+            total = int(batch.sum())
+            if total:
+                offsets = np.repeat(first[start:stop] - (np.cumsum(batch)
+                                                         - batch), batch)
+                index = offsets + np.arange(total)
+                won[found[index] + np.repeat(lifted[start:stop], batch)
+                    - lo] = True
+            start = stop
+
+        #Settle the rest of the chunk in order.
+        small = squares[squares < hi - lo]
+        new = []
+        for i in np.flatnonzero(~won):
+            if not won[i]:
+                new.append(lo + int(i))
+                won[i + small[:np.searchsorted(small, hi - lo - i)]] = True
+
+        if count + len(new) > len(losing):
+            losing = np.resize(losing, 2 * (count + len(new)))
+        losing[count:count + len(new)] = new
+        count += len(new)
+
+        bits[lo // 8:(hi + 7) // 8] = np.packbits(~won, bitorder='little')
+
+    bits.flush()
+    del bits
+    return SubtractSquareTable(path)
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) == 3:
+        #Write a table: subtract_square_sieve.py path n
+        sieve(sys.argv[1], int(sys.argv[2]))
+    elif len(sys.argv) == 1:
+        import doctest
+        doctest.testmod()
+    else:
+        print('Usage: python subtract_square_sieve.py path n')
@@ -0,0 +1,100 @@
+from strategy import Strategy
+from subtract_square_move import SubtractSquareMove
+from subtract_square_state import squares_up_to
+from math import isqrt
+import random
+
+
+class SubtractSquareSolver(Strategy):
+    '''A strategy that plays Subtract-a-Square perfectly from a table of
+    won and lost totals.
+
+    The states of Subtract-a-Square form a DAG over the totals 0..N, so the
+    table is filled bottom-up instead of by recursion: a total is lost for
+    the player about to move exactly when no square can be subtracted to
+    reach a lost total. Each lost total marks every total a square above it
+    as won, so filling the table costs O(sqrt N) per lost total rather than
+    per total. The table grows whenever a larger total shows up.
+
+    wins: bytearray         -- wins[n] is 1 iff the player about to move
+                               from total n can force a win
+    losing: list of int     -- ascending totals n with wins[n] == 0
+    '''
+
+    def __init__(self, interactive=False):
+        '''(SubtractSquareSolver, bool) -> NoneType
+
+        Initialize a SubtractSquareSolver with a table of total 0 only.
+        '''
+        self.wins = bytearray(1)
+        self.losing = [0]
+
+    def _extend(self, n):
+        '''(SubtractSquareSolver, int) -> NoneType
+
+        Grow the table to cover every total up to n.
+        '''
+        start = len(self.wins)
+        if n < start:
+            return
+        wins = self.wins
+        wins.extend(bytes(n + 1 - start))
+        squares = squares_up_to(n)
+
+        #Lost totals already known win the new totals a square above them.
+        for lost in self.losing:
+            for i in range(isqrt(start - lost - 1), len(squares)):
+                if lost + squares[i] > n:
+                    break
+                wins[lost + squares[i]] = 1
+
+        #Every other new total is settled in order, lowest first.
+        for total in range(start, n + 1):
+            if not wins[total]:
+                self.losing.append(total)
+                for square in squares:
+                    if total + square > n:
+                        break
+                    wins[total + square] = 1
+
+    def is_winning(self, total):
+        '''(SubtractSquareSolver, int) -> bool
+
+        Return whether the player about to move from total can force a win.
+
+        >>> s = SubtractSquareSolver()
+        >>> [n for n in range(20) if not s.is_winning(n)]
+        [0, 2, 5, 7, 10, 12, 15, 17]
+        '''
+        self._extend(total)
+        return bool(self.wins[total])
+
+    def suggest_move(self, state):
+        '''(SubtractSquareSolver, SubtractSquareState) -> SubtractSquareMove
+
+        Return a move that takes the computer to a winnable game state, if
+        there is one, or else a random legal move.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> s = SubtractSquareSolver()
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=18))
+        SubtractSquareMove(16)
+        >>> s.suggest_move(SubtractSquareState('p1', current_total=10**6 + 1))
+        SubtractSquareMove(974169)
+        '''
+        #Should not ask the solver to suggest a move on a finished game.
+        if state.over:
+            raise Exception("Cannot suggest a move, game is over.")
+
+        total = state.current_total
+        self._extend(total)
+        #Largest square first, as in possible_next_moves.
+        for square in reversed(squares_up_to(total)):
+            if not self.wins[total - square]:
+                return SubtractSquareMove(square)
+        return random.choice(state.possible_next_moves())
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
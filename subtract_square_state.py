@@ -1,6 +1,7 @@
-from game_state import GameState
+from game_state import GameState, derived
 from subtract_square_move import SubtractSquareMove
-from math import sqrt
+from encoding import encode_varint, decode_varint
+from math import isqrt
 from random import randint
 
 
@@ -8,7 +9,16 @@ class SubtractSquareState(GameState):
     ''' The state of a Subtract Square game
 
     current_total: int   --- total to be subtracted from
+    outcome_table: SubtractSquareTable  --- class attribute, table of
+                                            losing totals to look outcomes
+                                            up in, or None
+    KEY_SALT: int        --- class constant, mixed into every key so that
+                             keys differ from those of other games
     '''
+    # assign class constants
+    KEY_SALT = 0x9e3779b97f4a7c15
+    supports_push = True
+    outcome_table = None
 
     def __init__(self, p, interactive=False, current_total=0):
         ''' (SubtractSquareState, int, str) -> NoneType
@@ -23,7 +33,7 @@ class SubtractSquareState(GameState):
             current_total = randint(1, int(input('Maximum starting value? ')))
         GameState.__init__(self, p)
         self.current_total = current_total
-        self.over = (current_total < 1)
+        self._history = []
         self.instructions = ('On your turn, you may remove any number so long '
                              'as it is (a) a perfect square, and '
                              '(b) no more than the current number.')
@@ -41,6 +51,46 @@ class SubtractSquareState(GameState):
         return 'SubtractSquareState({}, False, {})'.format(
             repr(self.next_player), repr(self.current_total))
 
+    def key(self):
+        ''' (SubtractSquareState) -> int
+
+        Return an integer key identifying SubtractSquareState self,
+        combining current_total and next_player, XORed with KEY_SALT.
+
+        >>> (SubtractSquareState('p1', current_total=17).key() ^
+        ...  SubtractSquareState.KEY_SALT)
+        34
+        >>> (SubtractSquareState('p2', current_total=17).key() ^
+        ...  SubtractSquareState.KEY_SALT)
+        35
+        '''
+        return ((self.current_total * 2 + (self.next_player == 'p2')) ^
+                SubtractSquareState.KEY_SALT)
+
+    def to_bytes(self):
+        ''' (SubtractSquareState) -> bytes
+
+        Return SubtractSquareState self encoded as a varint of
+        current_total, then 1 bit for next_player.
+
+        >>> SubtractSquareState('p2', current_total=100).to_bytes()
+        b'\\xc9\\x01'
+        '''
+        return encode_varint(self.current_total * 2 +
+                             (self.next_player == 'p2'))
+
+    @classmethod
+    def from_bytes(cls, data):
+        ''' (type, bytes) -> SubtractSquareState
+
+        Return the SubtractSquareState encoded in data by to_bytes.
+
+        >>> SubtractSquareState.from_bytes(b'\\xc9\\x01')
+        SubtractSquareState('p2', False, 100)
+        '''
+        key = decode_varint(data)[0]
+        return cls('p2' if key & 1 else 'p1', current_total=key >> 1)
+
     def __str__(self):
         ''' (SubtractSquareState) -> str
 
@@ -68,23 +118,95 @@ class SubtractSquareState(GameState):
                 self.current_total == other.current_total and
                 self.next_player == other.next_player)
 
-    def apply_move(self, move):
-        ''' (SubtractSquareState, SubtractSquareMove) -> SubtractSquareState
+    def is_legal(self, move):
+        ''' (SubtractSquareState, SubtractSquareMove) -> bool
+
+        Return whether move removes a perfect square no greater than
+        current_total.
+
+        >>> s = SubtractSquareState('p1', current_total=17)
+        >>> s.is_legal(SubtractSquareMove(16))
+        True
+        >>> s.is_legal(SubtractSquareMove(8))
+        False
+        >>> s.is_legal(SubtractSquareMove(25))
+        False
+        '''
+        return (move.amount <= self.current_total and
+                is_pos_square(move.amount))
+
+    def apply_move(self, move, trusted=False):
+        ''' (SubtractSquareState, SubtractSquareMove, bool)
+            -> SubtractSquareState
 
-        Return the new SubtractSquareState reached by applying move to self.
+        Return the new SubtractSquareState reached by applying move to self,
+        or None if move is illegal. If trusted, move is not checked.
 
         >>> s1 = SubtractSquareState('p1', current_total=17)
         >>> s2 = s1.apply_move(SubtractSquareMove(9))
         >>> print(s2)
         Current total: 8; next player: p2
         '''
-        if move in self.possible_next_moves():
+        if trusted or self.is_legal(move):
             new_total = self.current_total - move.amount
             return SubtractSquareState(self.opponent(),
                                        current_total=new_total)
         else:
             return None
 
+    def push(self, move):
+        ''' (SubtractSquareState, SubtractSquareMove) -> NoneType
+
+        Apply move to SubtractSquareState self in place.
+
+        >>> s = SubtractSquareState('p1', current_total=17)
+        >>> s.push(SubtractSquareMove(9))
+        >>> print(s)
+        Current total: 8; next player: p2
+        >>> s.pop()
+        >>> print(s)
+        Current total: 17; next player: p1
+        '''
+        self._history.append((move.amount, self._derived))
+        self._derived = {}
+        self.current_total -= move.amount
+        self.next_player = self.opponent()
+
+    def pop(self):
+        ''' (SubtractSquareState) -> NoneType
+
+        Undo the most recent push onto SubtractSquareState self.
+        '''
+        amount, self._derived = self._history.pop()
+        self.current_total += amount
+        self.next_player = self.opponent()
+
+    @derived
+    def is_over(self):
+        ''' (SubtractSquareState) -> bool
+
+        Return whether the game is over: nothing is left to subtract.
+
+        >>> SubtractSquareState('p1', current_total=0).is_over()
+        True
+        '''
+        return self.current_total < 1
+
+    def known_outcome(self):
+        '''(SubtractSquareState) -> float
+
+        Return the outcome for next_player with best play, looked up in
+        SubtractSquareState.outcome_table, or None if current_total is not
+        in the table.
+        '''
+        table = SubtractSquareState.outcome_table
+        if table is None or self.current_total not in table:
+            return None
+        elif table.is_losing(self.current_total):
+            return SubtractSquareState.LOSE
+        else:
+            return SubtractSquareState.WIN
+
     def rough_outcome(self):
         '''(SubtractSquareState) -> float
 
@@ -100,11 +222,13 @@ class SubtractSquareState(GameState):
         >>> SubtractSquareState('p1', current_total=16).rough_outcome()
         1.0
         '''
-        if is_pos_square(self.current_total):
+        known = self.known_outcome()
+        if known is not None:
+            return known
+        elif is_pos_square(self.current_total):
             return SubtractSquareState.WIN
-        elif all([is_pos_square(self.current_total - n**2)
-                  for n in range(1, self.current_total + 1)
-                  if n**2 < self.current_total]):
+        elif all([is_pos_square(self.current_total - square)
+                  for square in squares_up_to(self.current_total)]):
             return SubtractSquareState.LOSE
         else:
             return SubtractSquareState.DRAW
@@ -133,11 +257,27 @@ class SubtractSquareState(GameState):
         # http://en.wikipedia.org/wiki/Subtract_a_square
         return self.current_total == 0 and self.opponent() == player
 
+    def winning_moves(self, player):
+        ''' (SubtractSquareState, str) -> list of SubtractSquareMove
+
+        Return the moves that would win at once for player: taking the
+        whole of current_total, if it is a square.
+
+        >>> SubtractSquareState('p1', current_total=16).winning_moves('p1')
+        [SubtractSquareMove(16)]
+        >>> SubtractSquareState('p1', current_total=17).winning_moves('p1')
+        []
+        '''
+        if not self.over and is_pos_square(self.current_total):
+            return [SubtractSquareMove(self.current_total)]
+        return []
+
+    @derived
     def possible_next_moves(self):
         ''' (SubtractSquareState) -> list of SubtractSquareMove
 
         Return a (possibly empty) list of moves that are legal
-        from the present state.
+        from the present state, largest square first.
 
         >>> s1 = SubtractSquareState('p1', current_total=17)
         >>> L1 = s1.possible_next_moves()
@@ -146,9 +286,8 @@ SubtractSquareMove(9), SubtractSquareMove(16)]
         >>> len(L1) == len(L2) and all([m in L2 for m in L1])
         True
         '''
-        return [SubtractSquareMove(i**2)
-                for i in range(self.current_total, 0, -1)
-                if i*i <= self.current_total]
+        return [SubtractSquareMove(square)
+                for square in reversed(squares_up_to(self.current_total))]
 
 
 def is_pos_square(n):
@@ -161,8 +300,28 @@ def is_pos_square(n):
     >>> is_pos_square(9)
     True
     '''
-    from math import sqrt
-    return round(sqrt(n))**2 == n and n > 0
+    return n > 0 and isqrt(n)**2 == n
+
+
+# Ascending positive squares, shared by every SubtractSquareState and
+# extended as larger totals show up.
+_squares = []
+
+
+def squares_up_to(n):
+    '''(int) -> list of int
+
+    Return the ascending list of positive squares no greater than n.
+
+    >>> squares_up_to(17)
+    [1, 4, 9, 16]
+    >>> squares_up_to(0)
+    []
+    '''
+    root = isqrt(n) if n > 0 else 0
+    while len(_squares) < root:
+        _squares.append((len(_squares) + 1)**2)
+    return _squares[:root]
 
 
 if __name__ == '__main__':
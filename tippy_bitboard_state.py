@@ -0,0 +1,533 @@
+from game_state import GameState, derived
+from tippy_move import TippyMove
+from tippy_patterns import TippyPatterns
+from grid_symmetry import GridSymmetry
+from zobrist import ZobristTable
+from encoding import encode_grid, decode_grid
+
+
+class TippyBitboardState(GameState):
+    '''The state of a Tippy game, stored as bitboards.
+
+    Cell (row, column), counting from 0, is bit row * dimension + column of
+    a bitboard. Moves, legality and win detection are all bit operations,
+    so nothing is copied or scanned cell by cell. After a move, only the
+    tippy placements through the cell just played are checked for a win.
+
+    dimension (int) - number of rows (and columns) of the grid
+    x_bits (int) - bitboard of the cells holding an 'x'
+    o_bits (int) - bitboard of the cells holding an 'o'
+    won (bool) - whether either player has formed a tippy
+    codes (list of int) - (x_bits << dimension ** 2) | o_bits for the image
+                          of the grid under each of the 8 symmetries of the
+                          grid, as in GridSymmetry
+    outcome_table (TippyTablebase) - class attribute, tablebase to look
+                                     outcomes up in, or None
+
+    'p1' (the user) always places 'x', 'p2' (the computer) places 'o'.
+    '''
+    supports_push = True
+    positional_moves = True
+    outcome_table = None
+
+    def __init__(self, p, grid=None, interactive=False, dimension=0,
+                 x_bits=0, o_bits=0, won=None, codes=None):
+        '''(TippyBitboardState, str, list, bool, int, int, int, bool,
+            list of int) -> NoneType
+
+        Initialize a TippyBitboardState self from a grid, as for a
+        TippyGameState, or else from dimension and the bitboards x_bits
+        and o_bits. Pass in won and codes when it is already known whether
+        the grid has a tippy, and what its codes are.
+
+        Pass in True for interactive to play the game.
+
+        >>> t = TippyBitboardState('p1', grid=[['x', None], [None, 'o']])
+        >>> t.x_bits, t.o_bits
+        (1, 8)
+        '''
+        GameState.__init__(self, p)
+        self.instructions = ('Pick a row and column to place your x. '
+                             'First player to form a Tippy wins! ')
+        if interactive:
+            dimension = int(input("What dimension for the Tippy grid? "))
+        elif grid is not None:
+            dimension = len(grid)
+            for row_num in range(dimension):
+                for column_num in range(dimension):
+                    bit = 1 << (row_num * dimension + column_num)
+                    if grid[row_num][column_num] == 'x':
+                        x_bits |= bit
+                    elif grid[row_num][column_num] == 'o':
+                        o_bits |= bit
+        self.dimension, self.x_bits, self.o_bits = dimension, x_bits, o_bits
+        if won is None:
+            patterns = TippyPatterns.for_dimension(dimension)
+            won = patterns.has_tippy(x_bits) or patterns.has_tippy(o_bits)
+        self.won = won
+        if codes is None:
+            symmetry = GridSymmetry.for_dimension(dimension)
+            codes = [(x << (dimension * dimension)) | o for x, o in
+                     zip(symmetry.transform_bits(x_bits),
+                         symmetry.transform_bits(o_bits))]
+        self.codes = codes
+        self._history = []
+
+    @property
+    def grid(self):
+        '''(TippyBitboardState) -> list
+
+        Return the grid of TippyBitboardState self as a nested list of
+        'x', 'o' and None, as in a TippyGameState.
+
+        >>> TippyBitboardState('p1', grid=[['x', None], [None, 'o']]).grid
+        [['x', None], [None, 'o']]
+        '''
+        grid = []
+        for row_num in range(self.dimension):
+            row = []
+            for column_num in range(self.dimension):
+                bit = 1 << (row_num * self.dimension + column_num)
+                if self.x_bits & bit:
+                    row.append('x')
+                elif self.o_bits & bit:
+                    row.append('o')
+                else:
+                    row.append(None)
+            grid.append(row)
+        return grid
+
+    def __repr__(self):
+        '''(TippyBitboardState) -> str
+
+        Return TippyBitboardState self's constructor as evaluable string.
+
+        >>> TippyBitboardState('p1', grid=[['x', None], [None, 'o']])
+        TippyBitboardState('p1', grid=[['x', None], [None, 'o']])
+        '''
+        return 'TippyBitboardState({}, grid={})'.format(repr(self.next_player),
+                                                        self.grid)
+
+    def __str__(self):
+        '''(TippyBitboardState) -> str
+
+        Return a user friendly string version of TippyBitboardState self.
+
+        >>> print(TippyBitboardState('p1', grid=[['x', None], [None, 'o']]))
+        <BLANKLINE>
+        1: ['x', None]
+        2: [None, 'o']
+        Current player: p1
+        <BLANKLINE>
+        '''
+        grid = ''
+        row_counter = 1
+        for row in self.grid:
+            grid = grid + '\n' + str(row_counter) + ': ' + str(row)
+            row_counter += 1
+        return (grid + '\n' + 'Current player: {}'.format(self.next_player)
+                + '\n')
+
+    def __eq__(self, other):
+        '''(TippyBitboardState, object) -> bool
+
+        Return whether TippyBitboardState self is the same as other.
+
+        >>> t1 = TippyBitboardState('p1', grid=[['x', None], [None, 'o']])
+        >>> t2 = TippyBitboardState('p1', dimension=2, x_bits=1, o_bits=8)
+        >>> t1 == t2
+        True
+        '''
+        return (isinstance(other, TippyBitboardState) and
+                self.dimension == other.dimension and
+                self.x_bits == other.x_bits and
+                self.o_bits == other.o_bits and
+                self.next_player == other.next_player)
+
+    def key(self):
+        '''(TippyBitboardState) -> int
+
+        Return an integer that identifies TippyBitboardState self up to
+        rotation and reflection: the smallest of its codes, and the next
+        player, XORed with the base of the ZobristTable of its dimension so
+        that grids of different dimensions, and other games, do not share
+        keys. Every tippy rotated or reflected is still a tippy, so states
+        with the same key have the same score.
+
+        >>> t = TippyBitboardState('p2', grid=[['x', None], [None, 'o']])
+        >>> t.key() ^ ZobristTable.for_dimension(2).base
+        49
+        >>> t.key() == TippyBitboardState('p2', grid=[['o', None],
+        ...                                           [None, 'x']]).key()
+        True
+        >>> len(set([TippyBitboardState('p1', dimension=d).key()
+        ...          for d in (3, 4, 5)]))
+        3
+        >>> from subtract_square_state import SubtractSquareState
+        >>> (TippyBitboardState('p1', dimension=3).key() ==
+        ...  SubtractSquareState('p1', current_total=0).key())
+        False
+        '''
+        return (((min(self.codes) << 1) | (self.next_player == 'p2')) ^
+                ZobristTable.for_dimension(self.dimension).base)
+
+    def to_bytes(self):
+        '''(TippyBitboardState) -> bytes
+
+        Return TippyBitboardState self encoded by encode_grid, as for a
+        TippyGameState.
+
+        >>> TippyBitboardState('p1', grid=[['x', None],
+        ...                                [None, 'o']]).to_bytes()
+        b'\\x02\\x02\\x01'
+        '''
+        return encode_grid(self.grid, self.next_player)
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''(type, bytes) -> TippyBitboardState
+
+        Return the TippyBitboardState encoded in data by to_bytes.
+
+        >>> t = TippyBitboardState('p2', grid=[['x', None], [None, 'o']])
+        >>> TippyBitboardState.from_bytes(t.to_bytes()) == t
+        True
+        '''
+        grid, p = decode_grid(data)
+        return cls(p, grid=grid)
+
+    def get_move(self):
+        '''(TippyBitboardState) -> TippyMove
+
+        Return a move for a game of Tippy, based on user input.
+        '''
+        y = int(input("Pick a row: "))
+        x = int(input("Pick a column: "))
+        return TippyMove(x, y)
+
+    def _cell(self, move):
+        '''(TippyBitboardState, TippyMove) -> int
+
+        Return the cell number of move, or -1 if move lies off the grid.
+        '''
+        if 1 <= move.x <= self.dimension and 1 <= move.y <= self.dimension:
+            return (move.y - 1) * self.dimension + move.x - 1
+        return -1
+
+    def is_legal(self, move):
+        '''(TippyBitboardState, TippyMove) -> bool
+
+        Return whether move places a piece on an empty cell of the grid,
+        while the game is not over.
+
+        >>> t = TippyBitboardState('p1', grid=[['x', None], [None, None]])
+        >>> t.is_legal(TippyMove(2, 1))
+        True
+        >>> t.is_legal(TippyMove(1, 1))
+        False
+        >>> t.is_legal(TippyMove(3, 1))
+        False
+        '''
+        cell = self._cell(move)
+        return (not self.over and cell >= 0 and
+                not (self.x_bits | self.o_bits) >> cell & 1)
+
+    def apply_move(self, move, trusted=False):
+        '''(TippyBitboardState, TippyMove, bool) -> TippyBitboardState
+
+        Return the new TippyBitboardState after TippyMove is applied, or
+        None if move is illegal. If trusted, move is not checked.
+
+        >>> t1 = TippyBitboardState('p1', dimension=3)
+        >>> print(t1.apply_move(TippyMove(3, 1)))
+        <BLANKLINE>
+        1: [None, None, 'x']
+        2: [None, None, None]
+        3: [None, None, None]
+        Current player: p2
+        <BLANKLINE>
+        '''
+        if not (trusted or self.is_legal(move)):
+            return None
+        cell = (move.y - 1) * self.dimension + move.x - 1
+        patterns = TippyPatterns.for_dimension(self.dimension)
+        codes = [c | b for c, b in zip(self.codes, self._code_bits(cell))]
+        #Only a tippy through the new piece can be new.
+        if self.next_player == 'p1':
+            x_bits = self.x_bits | 1 << cell
+            return TippyBitboardState(
+                'p2', dimension=self.dimension, x_bits=x_bits,
+                o_bits=self.o_bits,
+                won=patterns.has_tippy_through(x_bits, cell), codes=codes)
+        else:
+            o_bits = self.o_bits | 1 << cell
+            return TippyBitboardState(
+                'p1', dimension=self.dimension, x_bits=self.x_bits,
+                o_bits=o_bits,
+                won=patterns.has_tippy_through(o_bits, cell), codes=codes)
+
+    def _code_bits(self, cell):
+        '''(TippyBitboardState, int) -> list of int
+
+        Return the bit that the next player placing a piece on cell sets in
+        each of the codes.
+        '''
+        shift = 0
+        if self.next_player == 'p1':
+            shift = self.dimension * self.dimension
+        return [1 << (image + shift) for image in
+                GridSymmetry.for_dimension(self.dimension).images[cell]]
+
+    def push(self, move):
+        '''(TippyBitboardState, TippyMove) -> NoneType
+
+        Apply move to TippyBitboardState self in place.
+
+        >>> t = TippyBitboardState('p1', dimension=2)
+        >>> t.push(TippyMove(2, 1))
+        >>> t.x_bits, t.next_player
+        (2, 'p2')
+        >>> t.pop()
+        >>> t.x_bits, t.next_player
+        (0, 'p1')
+        '''
+        cell = (move.y - 1) * self.dimension + move.x - 1
+        self._history.append((cell, self.won, self.codes, self._derived))
+        self._derived = {}
+        self.codes = [c | b for c, b in zip(self.codes, self._code_bits(cell))]
+        patterns = TippyPatterns.for_dimension(self.dimension)
+        if self.next_player == 'p1':
+            self.x_bits |= 1 << cell
+            self.won = patterns.has_tippy_through(self.x_bits, cell)
+            self.next_player = 'p2'
+        else:
+            self.o_bits |= 1 << cell
+            self.won = patterns.has_tippy_through(self.o_bits, cell)
+            self.next_player = 'p1'
+
+    def pop(self):
+        '''(TippyBitboardState) -> NoneType
+
+        Undo the most recent push onto TippyBitboardState self.
+        '''
+        cell, self.won, self.codes, self._derived = self._history.pop()
+        if self.next_player == 'p2':
+            self.x_bits &= ~(1 << cell)
+            self.next_player = 'p1'
+        else:
+            self.o_bits &= ~(1 << cell)
+            self.next_player = 'p2'
+
+    def _empty_bits(self):
+        '''(TippyBitboardState) -> int
+
+        Return the bitboard of empty cells.
+        '''
+        full = (1 << (self.dimension * self.dimension)) - 1
+        return full & ~(self.x_bits | self.o_bits)
+
+    @derived
+    def possible_next_moves(self):
+        '''(TippyBitboardState) -> list of TippyMove
+
+        Return a list of legal Tippy moves, in row-major order.
+
+        >>> t = TippyBitboardState('p1', grid=[['x', None], [None, 'o']])
+        >>> t.possible_next_moves()
+        [TippyMove(2, 1), TippyMove(1, 2)]
+        '''
+        legal_moves = []
+        cells = TippyMove.for_cells(self.dimension)
+        empty = self._empty_bits()
+        while empty:
+            #Take the lowest set bit, then clear it.
+            low = empty & -empty
+            legal_moves.append(cells[low.bit_length() - 1])
+            empty ^= low
+        return legal_moves
+
+    @derived
+    def distinct_next_moves(self):
+        '''(TippyBitboardState) -> list of TippyMove
+
+        Return the legal moves, in row-major order, leaving out each move
+        that leads to a rotation or reflection of the state reached by an
+        earlier move.
+
+        >>> TippyBitboardState('p1', dimension=3).distinct_next_moves()
+        [TippyMove(1, 1), TippyMove(2, 1), TippyMove(2, 2)]
+        '''
+        seen, moves = set(), []
+        for move in self.possible_next_moves():
+            cell = (move.y - 1) * self.dimension + move.x - 1
+            key = min([c | b for c, b in
+                       zip(self.codes, self._code_bits(cell))])
+            if key not in seen:
+                seen.add(key)
+                moves.append(move)
+        return moves
+
+    def canonical_move(self, move):
+        '''(TippyBitboardState, TippyMove) -> TippyMove
+
+        Return move as played from the rotation or reflection of the grid
+        that key() stands for.
+
+        >>> t = TippyBitboardState('p1', grid=[['x', None, None],
+        ...                                    [None, None, None],
+        ...                                    [None, None, None]])
+        >>> u = TippyBitboardState('p1', grid=[[None, None, 'x'],
+        ...                                    [None, None, None],
+        ...                                    [None, None, None]])
+        >>> t.canonical_move(TippyMove(2, 1)) == u.canonical_move(
+        ...     TippyMove(3, 2))
+        True
+        '''
+        return GridSymmetry.for_dimension(self.dimension).transform_move(
+            move, self._canonical_symmetry())
+
+    def move_from_canonical(self, move):
+        '''(TippyBitboardState, TippyMove) -> TippyMove
+
+        Return the move from TippyBitboardState self that canonical_move turns
+        into move.
+
+        >>> t = TippyBitboardState('p1', grid=[[None, None, 'x'],
+        ...                                    [None, None, None],
+        ...                                    [None, None, None]])
+        >>> t.move_from_canonical(t.canonical_move(TippyMove(3, 2)))
+        TippyMove(3, 2)
+        '''
+        return GridSymmetry.for_dimension(self.dimension).transform_move(
+            move, GridSymmetry.INVERSE[self._canonical_symmetry()])
+
+    def _canonical_symmetry(self):
+        '''(TippyBitboardState) -> int
+
+        Return the number of the symmetry, as in GridSymmetry, taking the
+        grid to the rotation or reflection that key() stands for.
+        '''
+        return self.codes.index(min(self.codes))
+
+    def _completing_cells(self, bits):
+        '''(TippyBitboardState, int) -> int
+
+        Return a bitboard of the empty cells that would complete a tippy
+        made of bits.
+        '''
+        return TippyPatterns.for_dimension(self.dimension).completing_cells(
+            bits, self._empty_bits())
+
+    def winning_moves(self, player):
+        '''(TippyBitboardState, str) -> list of TippyMove
+
+        Return the moves that would complete a tippy for player, in
+        row-major order.
+
+        >>> t = TippyBitboardState('p2', grid=[['x', 'x', None],
+        ...                                    [None, 'x', None],
+        ...                                    [None, None, 'o']])
+        >>> t.winning_moves('p1')
+        [TippyMove(3, 2)]
+        '''
+        if self.over:
+            return []
+        bits = self.x_bits if player == 'p1' else self.o_bits
+        cells = self._completing_cells(bits)
+        moves = TippyMove.for_cells(self.dimension)
+        winning = []
+        while cells:
+            #Take the lowest set bit, then clear it.
+            low = cells & -cells
+            winning.append(moves[low.bit_length() - 1])
+            cells ^= low
+        return winning
+
+    def win(self):
+        '''(TippyBitboardState) -> bool
+
+        Return whether either player has formed a tippy.
+
+        >>> TippyBitboardState('p1', grid=[['x', 'x', 'o'], ['o', 'x', 'x'],
+        ...                                ['o', 'o', None]]).win()
+        True
+        >>> TippyBitboardState('p1', grid=[['x', 'x', None], [None, 'x', 'o'],
+        ...                                ['o', 'o', None]]).win()
+        False
+        '''
+        return self.won
+
+    def winner(self, player):
+        '''(TippyBitboardState, str) -> bool
+
+        Return if player has won the game of Tippy.
+
+        >>> t = TippyBitboardState('p1', grid=[['o', 'o', 'x'],
+        ...                                    ['x', 'o', 'o'],
+        ...                                    ['x', 'x', None]])
+        >>> t.winner('p2')
+        True
+        >>> t.winner('p1')
+        False
+        '''
+        return self.win() and self.opponent() == player
+
+    @derived
+    def is_over(self):
+        '''(TippyBitboardState) -> bool
+
+        Return whether the game of Tippy is over.
+
+        >>> TippyBitboardState('p1', dimension=3).is_over()
+        False
+        '''
+        return not self._empty_bits() or self.win()
+
+    def known_outcome(self):
+        '''(TippyBitboardState) -> float
+
+        Return the outcome for next_player with best play, looked up in
+        TippyBitboardState.outcome_table, or None if the grid is not in the
+        table.
+        '''
+        table = TippyBitboardState.outcome_table
+        if table is None or table.dimension != self.dimension:
+            return None
+        return table.outcome(self.x_bits, self.o_bits, self.next_player)
+
+    def rough_outcome(self):
+        '''(TippyBitboardState) -> float
+
+        Return an estimate of outcome for next_player: the known_outcome if
+        there is one, else WIN if next_player can complete a tippy now, LOSE
+        if the opponent threatens to complete a tippy at two or more cells,
+        which cannot all be blocked, and DRAW otherwise.
+
+        >>> TippyBitboardState('p1', grid=[['x', 'x', None],
+        ...                                [None, 'x', None],
+        ...                                [None, None, None]]).rough_outcome()
+        1.0
+        >>> TippyBitboardState('p1', grid=[['o', 'o', None],
+        ...                                [None, 'o', None],
+        ...                                [None, None, None]]).rough_outcome()
+        0.0
+        '''
+        known = self.known_outcome()
+        if known is not None:
+            return known
+        if self.next_player == 'p1':
+            mine, theirs = self.x_bits, self.o_bits
+        else:
+            mine, theirs = self.o_bits, self.x_bits
+        if self._completing_cells(mine):
+            return TippyBitboardState.WIN
+        threats = self._completing_cells(theirs)
+        #More than one bit set: the opponent has two ways to win.
+        if threats & (threats - 1):
+            return TippyBitboardState.LOSE
+        return TippyBitboardState.DRAW
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
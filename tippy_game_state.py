@@ -1,6 +1,10 @@
-from game_state import GameState
+from game_state import GameState, derived
 from tippy_move import TippyMove
 from strategy_minimax import StrategyMinimax
+from zobrist import ZobristTable
+from grid_symmetry import GridSymmetry
+from tippy_patterns import TippyPatterns
+from encoding import encode_grid, decode_grid
 import copy
 
 
@@ -8,16 +12,28 @@ class TippyGameState(GameState):
     '''The state of a Tippy game. 
     
     grid (list) - A nested list representing a 2D grid
+    zobrist (list of int) - Zobrist hashes of grid and next_player under
+                            each of the 8 symmetries of the grid, as in
+                            ZobristTable.hash_symmetries
+    won (bool) - whether grid has a tippy made of one player's pieces
+    outcome_table (TippyTablebase) - class attribute, tablebase to look
+                                     outcomes up in, or None
     
     'p1' (the user) always places 'x', 'p2' (the computer) places 'o'.
     '''
+    supports_push = True
+    positional_moves = True
+    outcome_table = None
     
-    def __init__(self, p, grid=[], interactive=False):
-        '''(TippyGameState, str, list) -> NoneType
+    def __init__(self, p, grid=[], interactive=False, zobrist=None,
+                 won=None):
+        '''(TippyGameState, str, list, bool, int, bool) -> NoneType
         
         Initialize a TippyGameState self with a grid.
         
-        Pass in True for interactive to play the game.
+        Pass in True for interactive to play the game. Pass in zobrist, the
+        hashes of grid and p, and won, whether grid has a tippy, when they
+        are already known.
         
         >>> t = TippyGameState("p1", True)
         NoneType
@@ -30,7 +46,16 @@ class TippyGameState(GameState):
             dimension = int(input("What dimension for the Tippy grid? "))
             for x in range(dimension):
                 self.grid.append([None for i in range(dimension)])
-        self.over = self.is_over()
+        if zobrist is None:
+            zobrist = ZobristTable.for_dimension(
+                len(self.grid)).hash_symmetries(self.grid, p)
+        self.zobrist = zobrist
+        if won is None:
+            won = TippyPatterns.for_dimension(len(self.grid)).grid_has_tippy(
+                self.grid)
+        self.won = won
+        self.empty_count = sum([row.count(None) for row in self.grid])
+        self._history = []
     
     def __repr__(self):
         '''(TippyGameState) -> str
@@ -45,6 +70,61 @@ class TippyGameState(GameState):
         '''
         return 'TippyGameState({}, {})'.format(self.next_player, self.grid)
 
+    def key(self):
+        '''(TippyGameState) -> int
+
+        Return the smallest Zobrist hash of TippyGameState self under the
+        symmetries of the grid. Every tippy rotated or reflected is still a
+        tippy, so states that are rotations or reflections of each other
+        have the same key, and the same score.
+
+        >>> t1 = TippyGameState('p1', grid=[['x', None], [None, None]])
+        >>> t2 = TippyGameState('p2', grid=[[None, None], [None, None]])
+        >>> t1.key() == t2.apply_move(TippyMove(1, 1)).key()
+        False
+        >>> t3 = TippyGameState('p1', grid=[[None, None], [None, None]])
+        >>> t1.key() == t3.apply_move(TippyMove(1, 1)).key()
+        False
+        >>> t4 = TippyGameState('p2', grid=[['x', None], [None, None]])
+        >>> t4.key() == t3.apply_move(TippyMove(1, 1)).key()
+        True
+        >>> t4.key() == t3.apply_move(TippyMove(2, 2)).key()
+        True
+        >>> len(set([TippyGameState('p1', grid=[[None] * d
+        ...                                     for i in range(d)]).key()
+        ...          for d in (3, 4, 5)]))
+        3
+        >>> from subtract_square_state import SubtractSquareState
+        >>> (TippyGameState('p1', grid=[[None] * 3 for i in range(3)]).key()
+        ...  == SubtractSquareState('p1', current_total=0).key())
+        False
+        '''
+        return min(self.zobrist)
+
+    def to_bytes(self):
+        '''(TippyGameState) -> bytes
+
+        Return TippyGameState self encoded by encode_grid: the dimension,
+        1 bit for next_player, and 2 bits per cell.
+
+        >>> TippyGameState('p1', grid=[['x', None], [None, 'o']]).to_bytes()
+        b'\\x02\\x02\\x01'
+        '''
+        return encode_grid(self.grid, self.next_player)
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''(type, bytes) -> TippyGameState
+
+        Return the TippyGameState encoded in data by to_bytes.
+
+        >>> t = TippyGameState('p2', grid=[['x', None], [None, 'o']])
+        >>> TippyGameState.from_bytes(t.to_bytes()) == t
+        True
+        '''
+        grid, p = decode_grid(data)
+        return cls(p, grid=grid)
+
     def __eq__(self, other):
         ''' (TippyGameState, TippyGameState) -> bool
 
@@ -91,10 +171,29 @@ class TippyGameState(GameState):
         x = int(input("Pick a column: "))
         return TippyMove(x, y)
     
-    def apply_move(self, move):
-        ''' (TippyGameState, TippyMove) -> TippyGameState
+    def is_legal(self, move):
+        ''' (TippyGameState, TippyMove) -> bool
+
+        Return whether move places a piece on an empty cell of the grid of
+        TippyGameState self, while the game is not over.
+
+        >>> t = TippyGameState('p1', grid=[['x', None], [None, None]])
+        >>> t.is_legal(TippyMove(2, 1))
+        True
+        >>> t.is_legal(TippyMove(1, 1))
+        False
+        >>> t.is_legal(TippyMove(3, 1))
+        False
+        '''
+        return (not self.over and 1 <= move.x <= len(self.grid) and 
+                1 <= move.y <= len(self.grid) and 
+                self.grid[move.y - 1][move.x - 1] is None)
+
+    def apply_move(self, move, trusted=False):
+        ''' (TippyGameState, TippyMove, bool) -> TippyGameState
        
-        Return the new TippyGameState after TippyMove is applied.
+        Return the new TippyGameState after TippyMove is applied, or None
+        if move is illegal. If trusted, move is not checked.
        
         >>> t1 = TippyGameState('p1')
         >>> m1 = t1.apply_move(TippyMove(3, 1))
@@ -104,7 +203,7 @@ class TippyGameState(GameState):
         3: [None, None, None]
         Current player: p2
         '''
-        if move in self.possible_next_moves():
+        if trusted or self.is_legal(move):
             #use a copy?
             new_grid = copy.deepcopy(self.grid)
             
@@ -113,10 +212,65 @@ class TippyGameState(GameState):
                 c = "o"
                 
             new_grid[move.y - 1][move.x - 1] = c
-            return TippyGameState(self.opponent(), grid=new_grid) 
+            cell = (move.y - 1) * len(self.grid) + move.x - 1
+            #Update the hash for the new piece and the change of player.
+            table = ZobristTable.for_dimension(len(self.grid))
+            zobrist = [h ^ k ^ table.side for h, k in
+                       zip(self.zobrist, table.symmetric[c][cell])]
+            #Only a tippy through the new piece can be new.
+            won = (self.won or TippyPatterns.for_dimension(
+                len(self.grid)).grid_has_tippy_through(new_grid, cell))
+            return TippyGameState(self.opponent(), grid=new_grid,
+                                  zobrist=zobrist, won=won) 
         else:
             return None
             
+    def push(self, move):
+        ''' (TippyGameState, TippyMove) -> NoneType
+
+        Apply move to TippyGameState self in place, changing its grid.
+
+        >>> t = TippyGameState('p1', grid=[[None, None], [None, None]])
+        >>> t.push(TippyMove(2, 1))
+        >>> t.grid, t.next_player
+        ([[None, 'x'], [None, None]], 'p2')
+        >>> t.pop()
+        >>> t.grid, t.next_player
+        ([[None, None], [None, None]], 'p1')
+        '''
+        c = "x"
+        if self.next_player == "p2":
+            c = "o"
+        cell = (move.y - 1) * len(self.grid) + move.x - 1
+        self._history.append((move, self.won, self._derived))
+        self._derived = {}
+
+        self.grid[move.y - 1][move.x - 1] = c
+        table = ZobristTable.for_dimension(len(self.grid))
+        self.zobrist = [h ^ k ^ table.side for h, k in
+                        zip(self.zobrist, table.symmetric[c][cell])]
+        self.won = (self.won or TippyPatterns.for_dimension(
+            len(self.grid)).grid_has_tippy_through(self.grid, cell))
+        self.empty_count -= 1
+        self.next_player = self.opponent()
+
+    def pop(self):
+        ''' (TippyGameState) -> NoneType
+
+        Undo the most recent push onto TippyGameState self.
+        '''
+        move, self.won, self._derived = self._history.pop()
+        c = self.grid[move.y - 1][move.x - 1]
+        cell = (move.y - 1) * len(self.grid) + move.x - 1
+
+        self.grid[move.y - 1][move.x - 1] = None
+        table = ZobristTable.for_dimension(len(self.grid))
+        self.zobrist = [h ^ k ^ table.side for h, k in
+                        zip(self.zobrist, table.symmetric[c][cell])]
+        self.empty_count += 1
+        self.next_player = self.opponent()
+            
+    @derived
     def possible_next_moves(self):
         '''(TippyGameState) -> list
         
@@ -129,103 +283,128 @@ class TippyGameState(GameState):
         [TippyMove(1, 3)]
         '''
         legal_moves = []
+        #The shared move for each cell, in row-major order.
+        cells = TippyMove.for_cells(len(self.grid))
         #check each row of the grid...
         for row_num in range(len(self.grid)):
             for column_num in range(len(self.grid[row_num])):
-                y = row_num + 1
-                x = column_num + 1
                 #if there is no letter at position, append to legal_moves
                 if (not self.grid[row_num][column_num] == 'x' 
                     and not self.grid[row_num][column_num] == 'o'):
-                    legal_moves.append(TippyMove(x, y))
+                    legal_moves.append(
+                        cells[row_num * len(self.grid) + column_num])
         return legal_moves
+
+    def winning_moves(self, player):
+        '''(TippyGameState, str) -> list of TippyMove
+
+        Return the moves that would complete a tippy for player, in
+        row-major order.
+
+        >>> t = TippyGameState('p2', grid=[['x', 'x', None], [None, 'x', None],
+        ...                                [None, None, 'o']])
+        >>> t.winning_moves('p1')
+        [TippyMove(3, 2)]
+        '''
+        if self.over:
+            return []
+        piece = 'x' if player == 'p1' else 'o'
+        cells = TippyPatterns.for_dimension(
+            len(self.grid)).grid_completing_cells(self.grid, piece)
+        moves = TippyMove.for_cells(len(self.grid))
+        return [moves[cell] for cell in cells]
+
+    @derived
+    def distinct_next_moves(self):
+        '''(TippyGameState) -> list of TippyMove
+
+        Return the legal moves from TippyGameState self, leaving out each
+        move that leads to a rotation or reflection of the state reached
+        by an earlier move.
+
+        >>> t = TippyGameState('p1', grid=[[None, None, None],
+        ...                                [None, None, None],
+        ...                                [None, None, None]])
+        >>> t.distinct_next_moves()
+        [TippyMove(1, 1), TippyMove(2, 1), TippyMove(2, 2)]
+        '''
+        c = "x"
+        if self.next_player == "p2":
+            c = "o"
+        table = ZobristTable.for_dimension(len(self.grid))
+        seen, moves = set(), []
+        for move in self.possible_next_moves():
+            cell = (move.y - 1) * len(self.grid) + move.x - 1
+            #The side key changes every hash alike, so it can be left out.
+            key = min([h ^ k for h, k in
+                       zip(self.zobrist, table.symmetric[c][cell])])
+            if key not in seen:
+                seen.add(key)
+                moves.append(move)
+        return moves
+
+    def canonical_move(self, move):
+        '''(TippyGameState, TippyMove) -> TippyMove
+
+        Return move as played from the rotation or reflection of the grid
+        that key() stands for.
+
+        >>> t = TippyGameState('p1', grid=[['x', None, None],
+        ...                                [None, None, None],
+        ...                                [None, None, None]])
+        >>> u = TippyGameState('p1', grid=[[None, None, 'x'],
+        ...                                [None, None, None],
+        ...                                [None, None, None]])
+        >>> t.canonical_move(TippyMove(2, 1)) == u.canonical_move(
+        ...     TippyMove(3, 2))
+        True
+        '''
+        return GridSymmetry.for_dimension(len(self.grid)).transform_move(
+            move, self._canonical_symmetry())
+
+    def move_from_canonical(self, move):
+        '''(TippyGameState, TippyMove) -> TippyMove
+
+        Return the move from TippyGameState self that canonical_move turns into
+        move.
+
+        >>> t = TippyGameState('p1', grid=[[None, None, 'x'],
+        ...                                [None, None, None],
+        ...                                [None, None, None]])
+        >>> t.move_from_canonical(t.canonical_move(TippyMove(3, 2)))
+        TippyMove(3, 2)
+        '''
+        return GridSymmetry.for_dimension(len(self.grid)).transform_move(
+            move, GridSymmetry.INVERSE[self._canonical_symmetry()])
+
+    def _canonical_symmetry(self):
+        '''(TippyGameState) -> int
+
+        Return the number of the symmetry, as in GridSymmetry, taking the
+        grid to the rotation or reflection that key() stands for.
+        '''
+        return self.zobrist.index(min(self.zobrist))
     
     def win(self):
         '''(TippyGameState) -> bool
         
-        Return whether a game of Tippy has a winning sequence.
+        Return whether a game of Tippy has a winning sequence: a tippy made
+        of one player's pieces.
         
-        >>> t = TippyGameState('p1')
-        >>> t.grid=[['x', 'x', 'o'], ['o', 'x', 'x'], ['o', 'o', None]]
+        >>> t = TippyGameState('p1', grid=[['x', 'x', 'o'], ['o', 'x', 'x'], 
+        ...                                ['o', 'o', None]])
         >>> t.win()
         True
         '''
-        #check to see how many letters have been placed on the grid
-        letter_count = 0
-        for row_num in range(len(self.grid)):
-            for column_num in range(len(self.grid[row_num])):
-                if (self.grid[row_num][column_num] == 'x' or 
-                    self.grid[row_num][column_num] == 'o'):
-                        letter_count += 1
-        #if there are enough letters to win the game...
-        if letter_count >= 7:
-            #loop through the grid, and check for winning combinations
-            for x in range(len(self.grid)):
-                for y in range(len(self.grid)):
-                    try:
-                        if ((self.grid[x][y] == self.grid[x][y + 1] == 
-                             self.grid[x + 1][y + 1] == 
-                             self.grid[x + 1][y + 2])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x][y + 1] == self.grid[x][y + 2] == 
-                             self.grid[x + 1][y] == self.grid[x + 1][y + 1])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x + 1][y] == self.grid[x + 1][y + 1] == 
-                             self.grid[x + 2][y + 1] == 
-                             self.grid[x + 2][y + 2])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x + 1][y + 1] == 
-                             self.grid[x + 1][y + 2] == 
-                             self.grid[x + 2][y] == self.grid[x + 2][y + 1])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x][y] == self.grid[x + 1][y] == 
-                             self.grid[x + 1][y + 1] == 
-                             self.grid[x + 2][y + 1])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x][y + 1] == self.grid[x + 1][y + 1] == 
-                             self.grid[x + 1][y + 2] == 
-                             self.grid[x + 2][y + 2])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x][y + 2] == self.grid[x + 1][y + 1] == 
-                             self.grid[x + 1][y + 2] == 
-                             self.grid[x + 2][y + 1])):
-                            return True
-                    except IndexError:
-                        pass
-                    try:
-                        if ((self.grid[x][y + 1] == self.grid[x + 1][y] == 
-                             self.grid[x + 1][y + 1] == 
-                             self.grid[x + 2][y + 1])):
-                            return True
-                    except IndexError:
-                        pass
-        return False
+        return self.won
                 
     def winner(self, player):
         '''(TippyGameState, str) -> bool
         
         Return if player has won the game of Tippy.
         
-        >>> t = TippyGameState('p2')
-        >>> t.grid=[['o', 'o', 'x'], ['x', 'o', 'o'], ['x', 'x', None]]
+        >>> t = TippyGameState('p1', grid=[['o', 'o', 'x'], ['x', 'o', 'o'], 
+        ...                                ['x', 'x', None]])
         >>> t.winner('p2')
         True
         >>> t.winner('p1')
@@ -235,22 +414,43 @@ class TippyGameState(GameState):
         return self.win() and self.opponent() == player
         
         
+    @derived
     def is_over(self):
         '''(TippyGameState) -> bool
         
         Return whether the game of Tippy is over.
         
-        >>> t = TippyGameState('p1')
+        >>> t = TippyGameState('p1', grid=[[None, None], [None, None]])
         >>> t.is_over()
         False
-        >>> t.grid = [[None, 'x', 'x'], ['x', 'x', 'o'], ['o', 'o', None]]
+        >>> t = TippyGameState('p1', grid=[[None, 'x', 'x'], ['x', 'x', 'o'], 
+        ...                                ['o', 'o', None]])
         >>> t.is_over()
         True
         '''
-        return len(self.possible_next_moves()) == 0 or self.winner('p1') or self.winner('p2')
-        #self.win() or not self.possible_next_moves()
+        return self.empty_count == 0 or self.won
         
           
+    def known_outcome(self):
+        '''(TippyGameState) -> float
+
+        Return the outcome for next_player with best play, looked up in
+        TippyGameState.outcome_table, or None if grid is not in the table.
+        '''
+        table = TippyGameState.outcome_table
+        if (table is None or table.dimension != len(self.grid) or
+                self.empty_count > table.max_empty):
+            return None
+        x_bits, o_bits, bit = 0, 0, 1
+        for row in self.grid:
+            for c in row:
+                if c == 'x':
+                    x_bits |= bit
+                elif c == 'o':
+                    o_bits |= bit
+                bit <<= 1
+        return table.outcome(x_bits, o_bits, self.next_player)
+
     def rough_outcome(self):
         '''(TippyGameState) -> float
 
@@ -1,22 +1,71 @@
 from move import Move
+from encoding import encode_varint, decode_varint
 
 
 class TippyMove(Move):
     '''An 'x'/'o' move at column x and row y in a Tippy game.
+
+    TippyMoves are immutable and interned: there is only ever one TippyMove
+    for each x and y, so equal moves are the same object.
     
     x, y (int) - coordinates on the grid.
     '''
+    __slots__ = ('x', 'y')
+    _moves = {}
+    _cells = {}
     
-    def __init__(self, x, y):
-        '''(TippyMove, int, int) -> NoneType
+    def __new__(cls, x, y):
+        '''(type, int, int) -> TippyMove
         
-        Initialize a TippyMove self at x, y position on TippyGameState grid.
+        Return the TippyMove at x, y position on TippyGameState grid.
         
-        >>> t = TippyMove(1, 1)
-        NoneType
+        >>> TippyMove(1, 1) is TippyMove(1, 1)
+        True
+        '''
+        move = cls._moves.get((x, y))
+        if move is None:
+            move = object.__new__(cls)
+            object.__setattr__(move, 'x', x)
+            object.__setattr__(move, 'y', y)
+            cls._moves[(x, y)] = move
+        return move
+
+    def __setattr__(self, name, value):
+        '''(TippyMove, str, object) -> NoneType
+
+        Refuse to change TippyMove self, which may be shared.
+
+        >>> TippyMove(1, 1).x = 2
+        Traceback (most recent call last):
+        ...
+        Exception: TippyMove is immutable
+        '''
+        raise Exception("TippyMove is immutable")
+
+    def __reduce__(self):
+        '''(TippyMove) -> tuple
+
+        Return how to rebuild TippyMove self, as the interned TippyMove with
+        the same x and y.
+        '''
+        return TippyMove, (self.x, self.y)
+
+    @classmethod
+    def for_cells(cls, dimension):
+        '''(type, int) -> list of TippyMove
+
+        Return the TippyMove of each cell of a dimension by dimension grid,
+        in row-major order, so cell number row * dimension + column can be
+        looked up without building a move.
+
+        >>> TippyMove.for_cells(2)
+        [TippyMove(1, 1), TippyMove(2, 1), TippyMove(1, 2), TippyMove(2, 2)]
         '''
-        self.x = x
-        self.y = y
+        if dimension not in cls._cells:
+            cls._cells[dimension] = [cls(x, y)
+                                     for y in range(1, dimension + 1)
+                                     for x in range(1, dimension + 1)]
+        return cls._cells[dimension]
     
     def __repr__(self):
         ''' (TippyMove) -> str
@@ -54,8 +103,37 @@ class TippyMove(Move):
         >>> t1 == t3
         True
         '''
-        return (isinstance(other, TippyMove) and self.x == other.x
-                and self.y == other.y)
+        return self is other or (isinstance(other, TippyMove) and
+                                 self.x == other.x and self.y == other.y)
+
+    def __hash__(self):
+        ''' (TippyMove) -> int
+
+        Return a hash of TippyMove self, the same for equal moves.
+        '''
+        return hash((self.x, self.y))
+
+    def to_bytes(self):
+        ''' (TippyMove) -> bytes
+
+        Return TippyMove self encoded as varints of x then y.
+
+        >>> TippyMove(2, 3).to_bytes()
+        b'\\x02\\x03'
+        '''
+        return encode_varint(self.x) + encode_varint(self.y)
+
+    @classmethod
+    def from_bytes(cls, data):
+        ''' (type, bytes) -> TippyMove
+
+        Return the TippyMove encoded in data by to_bytes.
+
+        >>> TippyMove.from_bytes(b'\\x02\\x03')
+        TippyMove(2, 3)
+        '''
+        x, pos = decode_varint(data)
+        return cls(x, decode_varint(data, pos)[0])
     
 
 if __name__ == '__main__':
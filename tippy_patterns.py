@@ -0,0 +1,203 @@
+class TippyPatterns:
+    '''Every placement of a tippy on a square grid of one dimension.
+
+    Built once per dimension. Cell (row, column), counting from 0, is cell
+    number row * dimension + column, and bit of that number in a bitboard.
+
+    dimension: int              -- number of rows (and columns) of the grid
+    shapes: list of tuple       -- for each tippy orientation, the bit
+                                   offsets of its four cells from the
+                                   top-left corner of its bounding box, and
+                                   a bitboard of the corners where it fits
+    placements: list of tuple   -- the four (row, column) cells of every
+                                   placement of every orientation
+    masks: list of int          -- bitboard of each placement
+    cells_through: list of list -- for each cell number, the placements
+                                   covering that cell
+    masks_through: list of list -- for each cell number, the bitboards of
+                                   the placements covering that cell
+    '''
+    # Each orientation of a tippy, as (row, column) cells of its bounding box.
+    ORIENTATIONS = ([(0, 0), (0, 1), (1, 1), (1, 2)],
+                    [(0, 1), (0, 2), (1, 0), (1, 1)],
+                    [(0, 0), (1, 0), (1, 1), (2, 1)],
+                    [(0, 1), (1, 0), (1, 1), (2, 0)])
+    _patterns = {}
+
+    def __init__(self, dimension):
+        '''(TippyPatterns, int) -> NoneType
+
+        Initialize the TippyPatterns of a dimension by dimension grid.
+
+        >>> p = TippyPatterns(3)
+        >>> len(p.masks)
+        8
+        >>> p.placements[0]
+        ((0, 0), (0, 1), (1, 1), (1, 2))
+        >>> len(p.masks_through[4])
+        8
+        >>> len(p.masks_through[0])
+        2
+        '''
+        self.dimension = dimension
+        self.shapes, self.placements, self.masks = [], [], []
+        self.cells_through = [[] for i in range(dimension * dimension)]
+        self.masks_through = [[] for i in range(dimension * dimension)]
+        for cells in TippyPatterns.ORIENTATIONS:
+            height = max([r for (r, c) in cells]) + 1
+            width = max([c for (r, c) in cells]) + 1
+            anchors = 0
+            for row_num in range(dimension - height + 1):
+                for column_num in range(dimension - width + 1):
+                    anchors |= 1 << (row_num * dimension + column_num)
+                    placement = tuple([(row_num + r, column_num + c)
+                                       for (r, c) in cells])
+                    mask = 0
+                    for (r, c) in placement:
+                        mask |= 1 << (r * dimension + c)
+                    self.placements.append(placement)
+                    self.masks.append(mask)
+                    for (r, c) in placement:
+                        self.cells_through[r * dimension + c].append(
+                            placement)
+                        self.masks_through[r * dimension + c].append(mask)
+            self.shapes.append(([r * dimension + c for (r, c) in cells],
+                                anchors))
+
+    @classmethod
+    def for_dimension(cls, dimension):
+        '''(type, int) -> TippyPatterns
+
+        Return the shared TippyPatterns for a dimension by dimension grid,
+        building it the first time it is needed.
+
+        >>> TippyPatterns.for_dimension(4) is TippyPatterns.for_dimension(4)
+        True
+        '''
+        if dimension not in cls._patterns:
+            cls._patterns[dimension] = cls(dimension)
+        return cls._patterns[dimension]
+
+    def has_tippy(self, bits):
+        '''(TippyPatterns, int) -> bool
+
+        Return whether the cells set in bitboard bits include a tippy.
+
+        >>> p = TippyPatterns.for_dimension(3)
+        >>> p.has_tippy(0b000011110)
+        True
+        >>> p.has_tippy(0b000010111)
+        False
+        '''
+        for mask in self.masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def has_tippy_through(self, bits, cell):
+        '''(TippyPatterns, int, int) -> bool
+
+        Return whether the cells set in bitboard bits include a tippy
+        covering cell number cell.
+
+        >>> p = TippyPatterns.for_dimension(3)
+        >>> p.has_tippy_through(0b000011110, 4)
+        True
+        >>> p.has_tippy_through(0b000011110, 8)
+        False
+        '''
+        for mask in self.masks_through[cell]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    def grid_has_tippy(self, grid):
+        '''(TippyPatterns, list) -> bool
+
+        Return whether grid, a nested list of 'x', 'o' and None, has a
+        tippy made of one player's pieces.
+
+        >>> p = TippyPatterns.for_dimension(3)
+        >>> p.grid_has_tippy([['x', 'x', 'o'], ['o', 'x', 'x'],
+        ...                   ['o', 'o', None]])
+        True
+        >>> p.grid_has_tippy([[None, None, 'o'], ['x', None, None],
+        ...                   ['o', 'x', 'x']])
+        False
+        '''
+        for ((r0, c0), (r1, c1), (r2, c2), (r3, c3)) in self.placements:
+            piece = grid[r0][c0]
+            if (piece is not None and grid[r1][c1] == piece and
+                    grid[r2][c2] == piece and grid[r3][c3] == piece):
+                return True
+        return False
+
+    def grid_has_tippy_through(self, grid, cell):
+        '''(TippyPatterns, list, int) -> bool
+
+        Return whether grid has a tippy made of one player's pieces
+        covering cell number cell.
+
+        >>> p = TippyPatterns.for_dimension(3)
+        >>> g = [['x', 'x', 'o'], ['o', 'x', 'x'], ['o', 'o', None]]
+        >>> p.grid_has_tippy_through(g, 5)
+        True
+        >>> p.grid_has_tippy_through(g, 6)
+        False
+        '''
+        for ((r0, c0), (r1, c1), (r2, c2), (r3, c3)) in \
+                self.cells_through[cell]:
+            piece = grid[r0][c0]
+            if (piece is not None and grid[r1][c1] == piece and
+                    grid[r2][c2] == piece and grid[r3][c3] == piece):
+                return True
+        return False
+
+    def completing_cells(self, bits, empty):
+        '''(TippyPatterns, int, int) -> int
+
+        Return a bitboard of the cells set in bitboard empty that would
+        complete a tippy made of the cells set in bits.
+
+        >>> p = TippyPatterns.for_dimension(3)
+        >>> bin(p.completing_cells(0b000010011, 0b111101100))
+        '0b100000'
+        '''
+        cells = 0
+        for offsets, anchors in self.shapes:
+            for missing in offsets:
+                hits = anchors & (empty >> missing)
+                for offset in offsets:
+                    if offset != missing:
+                        hits &= bits >> offset
+                cells |= hits << missing
+        return cells
+
+    def grid_completing_cells(self, grid, piece):
+        '''(TippyPatterns, list, str) -> list of int
+
+        Return the numbers of the empty cells of grid that would complete a
+        tippy of piece, in increasing order.
+
+        >>> p = TippyPatterns.for_dimension(3)
+        >>> p.grid_completing_cells([['x', 'x', None], [None, 'x', None],
+        ...                          [None, None, 'o']], 'x')
+        [5]
+        '''
+        cells = set()
+        for placement in self.placements:
+            empty = None
+            for (r, c) in placement:
+                if grid[r][c] is None and empty is None:
+                    empty = r * self.dimension + c
+                elif grid[r][c] != piece:
+                    break
+            else:
+                if empty is not None:
+                    cells.add(empty)
+        return sorted(cells)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
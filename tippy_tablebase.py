@@ -0,0 +1,271 @@
+from tippy_patterns import TippyPatterns
+from game_state import GameState
+from itertools import combinations
+from math import comb
+import numpy as np
+
+
+class TippyTablebase:
+    '''A read-only, memory-mapped table of the outcome with best play of
+    every Tippy position with at most max_empty empty cells on a grid of
+    one dimension, written by generate.
+
+    Cells are numbered as in TippyPatterns. As 'p1' places 'x' and the
+    players take turns, the number of empty cells and the player to move
+    fix how many of the f filled cells hold an 'x': f // 2 if 'p1' is to
+    move, or else (f + 1) // 2. Positions are kept in a block for each
+    number of empty cells e, from 0 to max_empty, and each player to move,
+    'p1' first. Within a block, a position is numbered by the colex rank of
+    its set of empty cells, times the number of ways to place the 'x's,
+    plus the colex rank of the places of its 'x's among its filled cells.
+    This is a perfect hash: every position of the block has its own number,
+    and every number is used.
+
+    The file holds dimension and max_empty as 8 little-endian bytes each,
+    then each block in turn, at 2 bits per position, four positions per
+    byte, least significant first: 0 if the player to move loses, 1 for a
+    tie and 2 for a win.
+
+    Set TippyGameState.outcome_table or TippyBitboardState.outcome_table
+    to a TippyTablebase to have known_outcome look positions up in it, so
+    that every strategy stops its search there. game_view loads the table
+    in tippy_<dimension>.tablebase for the grid being played, if there is
+    one. Write it from the command line, for instance:
+
+        python tippy_tablebase.py tippy_3.tablebase 3 9
+
+    dimension: int          -- number of rows (and columns) of the grid
+    max_empty: int          -- most empty cells of a position in the table
+    offsets: dict           -- maps (e, p) to the byte offset of the block
+                               of positions with e empty cells and p to
+                               move
+    codes: numpy.memmap     -- the packed outcomes, mapped read-only
+    '''
+
+    def __init__(self, path):
+        '''(TippyTablebase, str) -> NoneType
+
+        Open the tablebase written by generate to path.
+        '''
+        with open(path, 'rb') as f:
+            self.dimension = int.from_bytes(f.read(8), 'little')
+            self.max_empty = int.from_bytes(f.read(8), 'little')
+        self.offsets, size = _block_offsets(self.dimension, self.max_empty)
+        self.codes = np.memmap(path, dtype=np.uint8, mode='r', offset=16,
+                               shape=(size,))
+        cells = self.dimension * self.dimension
+        self._comb = [[comb(n, k) for k in range(cells + 2)]
+                      for n in range(cells + 1)]
+
+    def outcome(self, x_bits, o_bits, p):
+        '''(TippyTablebase, int, int, str) -> float
+
+        Return the outcome with best play for p, the player to move, of the
+        position with bitboards x_bits of 'x' and o_bits of 'o', or None if
+        the position is not in the table.
+        '''
+        cells = self.dimension * self.dimension
+        empty = ((1 << cells) - 1) & ~(x_bits | o_bits)
+        e = bin(empty).count('1')
+        if e > self.max_empty:
+            return None
+        filled = cells - e
+        x = filled // 2 if p == 'p1' else (filled + 1) // 2
+        if bin(x_bits).count('1') != x:
+            return None
+
+        #Colex ranks of the empty cells, and of the 'x's among the filled.
+        empty_rank, x_rank, e_seen, f_seen, x_seen = 0, 0, 0, 0, 0
+        for cell in range(cells):
+            if empty >> cell & 1:
+                e_seen += 1
+                empty_rank += self._comb[cell][e_seen]
+            else:
+                if x_bits >> cell & 1:
+                    x_seen += 1
+                    x_rank += self._comb[f_seen][x_seen]
+                f_seen += 1
+        index = empty_rank * self._comb[filled][x] + x_rank
+        code = self.codes[self.offsets[(e, p)] + (index >> 2)]
+        return (GameState.LOSE, GameState.DRAW,
+                GameState.WIN)[code >> ((index & 3) * 2) & 3]
+
+
+def _block_offsets(dimension, max_empty):
+    '''(int, int) -> tuple of (dict, int)
+
+    Return the byte offset of each block of a TippyTablebase of dimension
+    and max_empty, as in TippyTablebase.offsets, and the total bytes of the
+    blocks.
+
+    >>> _block_offsets(2, 1)
+    ({(0, 'p1'): 0, (0, 'p2'): 2, (1, 'p1'): 4, (1, 'p2'): 7}, 10)
+    '''
+    cells = dimension * dimension
+    offsets, size = {}, 0
+    for e in range(max_empty + 1):
+        filled = cells - e
+        for p, x in (('p1', filled // 2), ('p2', (filled + 1) // 2)):
+            offsets[(e, p)] = size
+            size += (comb(cells, e) * comb(filled, x) + 3) // 4
+    return offsets, size
+
+
+def _masks(n, k):
+    '''(int, int) -> numpy.ndarray
+
+    Return every n-bit mask with k bits set, in colex order, which is
+    ascending order.
+
+    >>> _masks(3, 2)
+    array([3, 5, 6], dtype=uint64)
+    '''
+    return np.array(sorted([sum([1 << i for i in subset])
+                            for subset in combinations(range(n), k)]),
+                    dtype=np.uint64)
+
+
+def _has_tippy(bits, masks):
+    '''(numpy.ndarray, list of int) -> numpy.ndarray
+
+    Return whether each bitboard of bits holds one of the tippies masks.
+    '''
+    found = np.zeros(bits.shape, dtype=bool)
+    for mask in masks:
+        mask = np.uint64(mask)
+        found |= (bits & mask) == mask
+    return found
+
+
+def generate(path, dimension, max_empty, chunk_size=1 << 20):
+    '''(str, int, int, int) -> TippyTablebase
+
+    Solve every Tippy position of a dimension by dimension grid with at
+    most max_empty empty cells, write the outcomes to path as a
+    TippyTablebase, and return it.
+
+    Every move fills one empty cell, so the positions with e empty cells
+    depend only on those with e - 1. The blocks are solved by retrograde
+    analysis one number of empty cells at a time, from full grids up: a
+    position with a tippy is lost for the player to move, a full grid
+    without one is a tie, and any other position is worth the best, for
+    the player to move, of the positions its moves lead to, already solved.
+    Only the outcomes of the layer below are kept in memory, unpacked, and
+    positions are solved as NumPy arrays of bitboards, chunk_size at a
+    time. As colex order is ascending order, the number of the position a
+    move leads to is found by binary search in the sorted masks of the
+    layer below.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), 'tippy.bin')
+    >>> table = generate(path, 3, 4)
+    >>> from tippy_bitboard_state import TippyBitboardState
+    >>> t = TippyBitboardState('p2', grid=[['x', 'x', 'o'],
+    ...                                    [None, 'x', 'o'],
+    ...                                    [None, None, None]])
+    >>> table.outcome(t.x_bits, t.o_bits, t.next_player)
+    0.0
+    >>> t = TippyBitboardState('p2', grid=[[None, None, 'x'],
+    ...                                    [None, 'o', 'x'],
+    ...                                    ['x', 'o', None]])
+    >>> table.outcome(t.x_bits, t.o_bits, t.next_player)
+    1.0
+    >>> table.outcome(0, 0, 'p1') is None
+    True
+    '''
+    cells = dimension * dimension
+    full = np.uint64((1 << cells) - 1)
+    masks = TippyPatterns.for_dimension(dimension).masks
+    offsets, size = _block_offsets(dimension, max_empty)
+    with open(path, 'wb') as f:
+        f.write(dimension.to_bytes(8, 'little'))
+        f.write(max_empty.to_bytes(8, 'little'))
+        f.truncate(16 + size)
+    codes = np.memmap(path, dtype=np.uint8, mode='r+', offset=16,
+                      shape=(size,))
+
+    below, below_empties, below_places = None, None, None
+    for e in range(max_empty + 1):
+        filled = cells - e
+        empties = _masks(cells, e)
+        layer, places_of = {}, {}
+        for p, x in (('p1', filled // 2), ('p2', (filled + 1) // 2)):
+            places = places_of[p] = _masks(filled, x)
+            block = np.empty(len(empties) * len(places), dtype=np.uint8)
+            rows = max(1, chunk_size // len(places))
+            for start in range(0, len(empties), rows):
+                empty = empties[start:start + rows]
+                #The number of each empty and each filled cell of each row.
+                empty_cells = np.zeros((len(empty), e), dtype=np.uint64)
+                filled_cells = np.zeros((len(empty), filled), dtype=np.uint64)
+                e_seen = np.zeros(len(empty), dtype=np.int64)
+                f_seen = np.zeros(len(empty), dtype=np.int64)
+                for cell in range(cells):
+                    is_empty = (empty >> np.uint64(cell)) & np.uint64(1) == 1
+                    row_nums = np.flatnonzero(is_empty)
+                    empty_cells[row_nums, e_seen[row_nums]] = cell
+                    e_seen[row_nums] += 1
+                    row_nums = np.flatnonzero(~is_empty)
+                    filled_cells[row_nums, f_seen[row_nums]] = cell
+                    f_seen[row_nums] += 1
+                #Place the 'x's of each of places among the filled cells.
+                x_bits = np.zeros((len(empty), len(places)), dtype=np.uint64)
+                for i in range(filled):
+                    x_bits |= (((places >> np.uint64(i)) & np.uint64(1))
+                               [None, :] << filled_cells[:, i][:, None])
+                o_bits = full & ~empty[:, None] & ~x_bits
+
+                over = _has_tippy(x_bits, masks) | _has_tippy(o_bits, masks)
+                best = np.full(x_bits.shape, -1, dtype=np.int8)
+                if e == 0:
+                    best[~over] = 0
+                else:
+                    #Try each move, looking its outcome up in the layer below.
+                    other = 'p2' if p == 'p1' else 'p1'
+                    child_places = below_places[other]
+                    piece = np.uint64(p == 'p1')
+                    for j in range(e):
+                        #Fill the j-th empty cell, which has q filled cells
+                        #before it, so the new piece is the q-th filled.
+                        cell = empty_cells[:, j]
+                        q = (cell - np.uint64(j))[:, None]
+                        empty_rank = np.searchsorted(
+                            below_empties, empty & ~(np.uint64(1) << cell))
+                        low = places[None, :] & ((np.uint64(1) << q) -
+                                                 np.uint64(1))
+                        high = (places[None, :] >> q) << (q + np.uint64(1))
+                        index = (empty_rank[:, None] * len(child_places) +
+                                 np.searchsorted(child_places,
+                                                 low | high | piece << q))
+                        best = np.maximum(
+                            best, 1 - below[other][index].astype(np.int8))
+                    best[over] = -1
+                block[start * len(places):
+                      (start + len(empty)) * len(places)] = (best + 1).ravel()
+            layer[p] = block
+
+            #Pack four outcomes per byte, least significant first.
+            padded = np.zeros((len(block) + 3) // 4 * 4, dtype=np.uint8)
+            padded[:len(block)] = block
+            padded = padded.reshape(-1, 4)
+            offset = offsets[(e, p)]
+            codes[offset:offset + len(padded)] = (
+                padded[:, 0] | padded[:, 1] << 2 | padded[:, 2] << 4 |
+                padded[:, 3] << 6)
+        below, below_empties, below_places = layer, empties, places_of
+
+    codes.flush()
+    del codes
+    return TippyTablebase(path)
+
+
+if __name__ == '__main__':
+    import sys
+    if len(sys.argv) == 4:
+        #Write a tablebase: tippy_tablebase.py path dimension max_empty
+        generate(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
+    elif len(sys.argv) == 1:
+        import doctest
+        doctest.testmod()
+    else:
+        print('Usage: python tippy_tablebase.py path dimension max_empty')
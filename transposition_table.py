@@ -0,0 +1,167 @@
+from collections import namedtuple, OrderedDict
+from itertools import islice
+
+
+TableEntry = namedtuple('TableEntry', ['score', 'flag', 'depth', 'move'])
+
+
+class TranspositionTable:
+    '''A cache of searched GameState scores shared by pruned and
+    depth-limited searches.
+
+    Each entry records the score for the player about to move together with
+    its bound type, the remaining depth it was searched to, and the best
+    move found (or None).
+
+    A table may be bounded to a number of entries. Once full, storing a new
+    key evicts the shallowest of the SAMPLE least recently stored entries,
+    so deep searches, which are costly to redo, stay cached longest.
+
+    entries: OrderedDict -- maps state keys to TableEntry tuples, least
+                           recently stored first
+    max_entries: int    -- most entries kept, or None for no limit
+    hits: int           -- number of probes that settled a search
+    misses: int         -- number of probes that did not
+    evictions: int      -- number of entries evicted to stay in bounds
+    EXACT: int          -- class constant, score is the exact value
+    LOWER: int          -- class constant, true value is at least score
+    UPPER: int          -- class constant, true value is at most score
+    FULL_DEPTH: int     -- class constant, depth recorded for a search that
+                           ran to the end of the game
+    SAMPLE: int         -- class constant, number of entries considered
+                           for each eviction
+    '''
+    # assign class constants
+    EXACT, LOWER, UPPER = 0, 1, 2
+    FULL_DEPTH = 255
+    SAMPLE = 8
+
+    def __init__(self, max_entries=1 << 20):
+        '''(TranspositionTable, int) -> NoneType
+
+        Initialize an empty TranspositionTable holding at most max_entries
+        entries, or any number if max_entries is None.
+        '''
+        self.entries = OrderedDict()
+        self.max_entries = max_entries
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def __len__(self):
+        '''(TranspositionTable) -> int
+
+        Return the number of stored entries.
+        '''
+        return len(self.entries)
+
+    def bound_type(self, score, alpha, beta):
+        '''(TranspositionTable, float, float, float) -> int
+
+        Return the bound type of score, the result of a search
+        with window (alpha, beta).
+
+        >>> table = TranspositionTable()
+        >>> table.bound_type(0.0, -1.0, 1.0) == TranspositionTable.EXACT
+        True
+        >>> table.bound_type(1.0, -1.0, 0.0) == TranspositionTable.LOWER
+        True
+        >>> table.bound_type(-1.0, -1.0, 0.0) == TranspositionTable.UPPER
+        True
+        '''
+        if score <= alpha:
+            return TranspositionTable.UPPER
+        elif score >= beta:
+            return TranspositionTable.LOWER
+        else:
+            return TranspositionTable.EXACT
+
+    def get(self, key):
+        '''(TranspositionTable, object) -> TableEntry
+
+        Return the entry stored for key, or None.
+        '''
+        return self.entries.get(key)
+
+    def probe(self, key, depth, alpha, beta):
+        '''(TranspositionTable, object, int, float, float) -> float
+
+        Return a stored score for key that settles a search of depth
+        with window (alpha, beta), or None if there is none.
+
+        >>> table = TranspositionTable()
+        >>> table.store('k', 1.0, TranspositionTable.LOWER, 3)
+        >>> table.probe('k', 3, -1.0, 0.0)
+        1.0
+        >>> table.probe('k', 4, -1.0, 0.0) is None
+        True
+        >>> table.hits, table.misses
+        (1, 1)
+        '''
+        return self.probe_entry(self.get(key), depth, alpha, beta)
+
+    def probe_entry(self, entry, depth, alpha, beta):
+        '''(TranspositionTable, TableEntry, int, float, float) -> float
+
+        Return the score of entry, as returned by get, if it settles a
+        search of depth with window (alpha, beta), or None if it does not
+        or entry is None. Lets a search that also needs the entry's move
+        look the key up only once.
+
+        >>> table = TranspositionTable()
+        >>> table.store('k', -1.0, TranspositionTable.UPPER, 3, 'm')
+        >>> entry = table.get('k')
+        >>> table.probe_entry(entry, 3, -1.0, 0.0), entry.move
+        (-1.0, 'm')
+        >>> table.probe_entry(None, 3, -1.0, 0.0) is None
+        True
+        '''
+        if entry is not None and entry.depth >= depth:
+            if (entry.flag == TranspositionTable.EXACT or
+                    (entry.flag == TranspositionTable.LOWER and
+                     entry.score >= beta) or
+                    (entry.flag == TranspositionTable.UPPER and
+                     entry.score <= alpha)):
+                self.hits += 1
+                return entry.score
+        self.misses += 1
+        return None
+
+    def store(self, key, score, flag, depth, move=None):
+        '''(TranspositionTable, object, float, int, int, Move) -> NoneType
+
+        Record score with bound type flag for key, searched to depth.
+
+        An entry searched to a greater depth is never replaced by a
+        shallower one.
+
+        >>> table = TranspositionTable(max_entries=2)
+        >>> table.store('a', 1.0, TranspositionTable.EXACT, 5)
+        >>> table.store('b', 0.0, TranspositionTable.EXACT, 1)
+        >>> table.store('c', -1.0, TranspositionTable.EXACT, 3)
+        >>> sorted(table.entries), table.evictions
+        (['a', 'c'], 1)
+        '''
+        entry = self.entries.get(key)
+        if entry is None:
+            if (self.max_entries is not None and
+                    len(self.entries) >= self.max_entries):
+                self._evict()
+        elif depth >= entry.depth:
+            self.entries.move_to_end(key)
+        else:
+            return
+        self.entries[key] = TableEntry(score, flag, depth, move)
+
+    def _evict(self):
+        '''(TranspositionTable) -> NoneType
+
+        Remove the shallowest of the SAMPLE least recently stored entries.
+        '''
+        oldest = islice(self.entries.items(), TranspositionTable.SAMPLE)
+        key = min(oldest, key=lambda item: item[1].depth)[0]
+        del self.entries[key]
+        self.evictions += 1
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
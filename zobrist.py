@@ -0,0 +1,113 @@
+from grid_symmetry import GridSymmetry
+import random
+
+
+class ZobristTable:
+    '''Random 64-bit keys for incrementally hashing square game grids.
+
+    The hash of a grid is base XORed with the keys of its occupied cells,
+    and with side when 'p2' is about to move. As base is drawn apart for
+    each dimension, empty grids of different dimensions do not all hash
+    to 0. Placing or removing a piece is
+    one XOR, so a hash can be kept up to date move by move.
+
+    Keys are drawn from a generator seeded by the dimension, so the same
+    grid hashes to the same value in every run and every process.
+
+    dimension: int          -- number of rows (and columns) of the grid
+    cells: dict of list     -- maps 'x' and 'o' to one key per cell,
+                               indexed row * dimension + column
+    side: int               -- key for 'p2' being the next player
+    base: int               -- key every hash starts from
+    symmetric: dict of list -- maps 'x' and 'o' to, for each cell, the keys
+                               of the cells it is moved to by each of the
+                               8 symmetries of the grid, as in GridSymmetry
+    '''
+    _tables = {}
+
+    def __init__(self, dimension):
+        '''(ZobristTable, int) -> NoneType
+
+        Initialize a ZobristTable for a dimension by dimension grid.
+        '''
+        rng = random.Random(dimension)
+        self.dimension = dimension
+        self.cells = {c: [rng.getrandbits(64)
+                          for i in range(dimension * dimension)]
+                      for c in ('x', 'o')}
+        self.side = rng.getrandbits(64)
+        self.base = rng.getrandbits(64)
+        images = GridSymmetry.for_dimension(dimension).images
+        self.symmetric = {c: [tuple([self.cells[c][i] for i in cell_images])
+                              for cell_images in images]
+                          for c in ('x', 'o')}
+
+    @classmethod
+    def for_dimension(cls, dimension):
+        '''(type, int) -> ZobristTable
+
+        Return the shared ZobristTable for a dimension by dimension grid,
+        building it the first time it is needed.
+
+        >>> ZobristTable.for_dimension(3) is ZobristTable.for_dimension(3)
+        True
+        '''
+        if dimension not in cls._tables:
+            cls._tables[dimension] = cls(dimension)
+        return cls._tables[dimension]
+
+    def hash_grid(self, grid, p):
+        '''(ZobristTable, list, str) -> int
+
+        Return the hash of grid with next player p, computed from scratch.
+
+        >>> z = ZobristTable.for_dimension(2)
+        >>> h = z.hash_grid([['x', None], [None, None]], 'p2')
+        >>> h == z.base ^ z.cells['x'][0] ^ z.side
+        True
+        >>> z.hash_grid([[None, None], [None, None]], 'p1') == z.base
+        True
+        >>> z.base == ZobristTable.for_dimension(3).base
+        False
+        '''
+        h = self.base ^ self.side if p == 'p2' else self.base
+        for row_num in range(len(grid)):
+            for column_num in range(len(grid[row_num])):
+                c = grid[row_num][column_num]
+                if c == 'x' or c == 'o':
+                    h ^= self.cells[c][row_num * self.dimension + column_num]
+        return h
+
+    def hash_symmetries(self, grid, p):
+        '''(ZobristTable, list, str) -> list of int
+
+        Return the hashes of the images of grid under each of the 8
+        symmetries of the grid, in the order of GridSymmetry, with next
+        player p. The first is the hash of grid itself, and the smallest
+        is the same for every image of grid.
+
+        >>> z = ZobristTable.for_dimension(3)
+        >>> hashes = z.hash_symmetries([['x', None, None], [None, 'o', None],
+        ...                             [None, None, None]], 'p1')
+        >>> hashes[0] == z.hash_grid([['x', None, None], [None, 'o', None],
+        ...                           [None, None, None]], 'p1')
+        True
+        >>> min(hashes) == min(z.hash_symmetries(
+        ...     [[None, None, None], [None, 'o', None], [None, None, 'x']],
+        ...     'p1'))
+        True
+        '''
+        hashes = [self.base ^ self.side if p == 'p2' else self.base] * 8
+        for row_num in range(len(grid)):
+            for column_num in range(len(grid[row_num])):
+                c = grid[row_num][column_num]
+                if c == 'x' or c == 'o':
+                    keys = self.symmetric[c][row_num * self.dimension +
+                                             column_num]
+                    hashes = [h ^ k for h, k in zip(hashes, keys)]
+        return hashes
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()